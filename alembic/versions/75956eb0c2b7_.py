@@ -0,0 +1,67 @@
+"""full-text index over githubpullrequest
+
+Revision ID: 75956eb0c2b7
+Revises: 1fa88c71b7da
+Create Date: 2026-10-18 10:03:17.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '75956eb0c2b7'
+down_revision: Union[str, None] = '1fa88c71b7da'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXED_COLUMNS = "title, body, author, number, repository"
+
+
+def upgrade() -> None:
+    # FTS5 is SQLite-only; other databases keep the substring search.
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    # External-content table: the index stores tokens only, rows stay in
+    # githubpullrequest and the triggers keep both in step.
+    op.execute(f"""
+    CREATE VIRTUAL TABLE githubpullrequest_fts USING fts5(
+        {INDEXED_COLUMNS},
+        content='githubpullrequest',
+        content_rowid='id',
+        tokenize='unicode61',
+        prefix='2 3'
+    )
+    """)
+    op.execute(f"""
+    CREATE TRIGGER githubpullrequest_fts_insert AFTER INSERT ON githubpullrequest BEGIN
+        INSERT INTO githubpullrequest_fts(rowid, {INDEXED_COLUMNS})
+        VALUES (new.id, new.title, new.body, new.author, new.number, new.repository);
+    END
+    """)
+    op.execute(f"""
+    CREATE TRIGGER githubpullrequest_fts_delete AFTER DELETE ON githubpullrequest BEGIN
+        INSERT INTO githubpullrequest_fts(githubpullrequest_fts, rowid, {INDEXED_COLUMNS})
+        VALUES ('delete', old.id, old.title, old.body, old.author, old.number, old.repository);
+    END
+    """)
+    op.execute(f"""
+    CREATE TRIGGER githubpullrequest_fts_update AFTER UPDATE ON githubpullrequest BEGIN
+        INSERT INTO githubpullrequest_fts(githubpullrequest_fts, rowid, {INDEXED_COLUMNS})
+        VALUES ('delete', old.id, old.title, old.body, old.author, old.number, old.repository);
+        INSERT INTO githubpullrequest_fts(rowid, {INDEXED_COLUMNS})
+        VALUES (new.id, new.title, new.body, new.author, new.number, new.repository);
+    END
+    """)
+    op.execute("INSERT INTO githubpullrequest_fts(githubpullrequest_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    op.execute("DROP TRIGGER githubpullrequest_fts_update")
+    op.execute("DROP TRIGGER githubpullrequest_fts_delete")
+    op.execute("DROP TRIGGER githubpullrequest_fts_insert")
+    op.execute("DROP TABLE githubpullrequest_fts")
@@ -1,46 +1,46 @@
 from __future__ import annotations
 
-import os
+import asyncio
 
-import openai
 import reflex as rx
 
-from github import Github
-from sqlmodel import or_, select
-
+from .clients import get_github_client, get_github_response_cache, get_openai_client
 from .models import GithubPullRequest
-
-CLIENT_OPEN_AI = None
-CLIENT_GITHUB = None
-
-
-def get_github_client():
-    global CLIENT_GITHUB
-    if CLIENT_GITHUB is None:
-        github_token = os.environ.get("GITHUB_TOKEN")
-        if not github_token:
-            raise ValueError("GITHUB_TOKEN environment variable is not set")
-
-        CLIENT_GITHUB = Github(github_token)
-
-    return CLIENT_GITHUB
-
-
-def get_openai_client():
-    global CLIENT_OPEN_AI
-    if CLIENT_OPEN_AI is None:
-        CLIENT_OPEN_AI = openai.OpenAI(
-            api_key=os.environ["OPENAI_API_KEY"],
-        )
-
-    return CLIENT_OPEN_AI
+from .pagination import (
+    PAGE_CACHE,
+    InterruptibleQuery,
+    QueryInterrupted,
+    ReleaseScope,
+    cached_page,
+)
+from .pruning import exclude_pull_requests, matching_pull_request_ids
+from .changelog_cache import changelog_cache_key, get_cached_changelog, store_changelog
+from .generation import MODEL, stream_changelog
+from .streaming import coalesce
+from .sync import PullRequestSync, stored_pull_requests_between_tags
+
+# Seconds of quiet after a keystroke before the search query runs.
+SEARCH_DEBOUNCE = 0.3
+
+# The search query each session has in flight, by client token, so that the
+# next keystroke can interrupt it. Kept out of the state, which is serialized.
+RUNNING_SEARCHES: dict[str, InterruptibleQuery] = {}
 
 
 class State(rx.State):
     """The app state."""
 
     current_pull_request: GithubPullRequest = GithubPullRequest()
+    # The page of stored pull requests shown in the table.
     pull_requests: list[GithubPullRequest] = []
+    # The pull requests of the fetched release range, used for the changelog.
+    # Backend-only: the table shows them a page at a time.
+    _release_pull_requests: list[GithubPullRequest] = []
+    # The fetched range, which the table is scoped to.
+    _release: ReleaseScope | None = None
+    release_size: int = 0
+    # Whether the table shows only the fetched release or every stored row.
+    show_release: bool = False
     release_tag_start: str = ""
     release_tag_end: str = ""
     repository_url: str = ""
@@ -49,11 +49,36 @@ class State(rx.State):
         "Click 'Generate Changelog' make an AI generated changelog."
     )
     gen_response = False
+    use_changelog_cache: bool = True
     tone: str = "😊 Formal"
     length: str = "1000"
     search_value: str = ""
     sort_value: str = ""
     sort_reverse: bool = False
+    page_cursor: str = ""
+    previous_page_cursors: list[str] = []
+    next_page_cursor: str = ""
+    # Bumped on every keystroke; a search whose generation is no longer
+    # current has been superseded and drops its result.
+    _search_generation: int = 0
+    selected_ids: list[int] = []
+    exclude_author: str = ""
+    # A glob over titles, e.g. "Bump *".
+    exclude_title_pattern: str = ""
+
+    @rx.var
+    def has_previous_page(self) -> bool:
+        return len(self.previous_page_cursors) > 0
+
+    @rx.var
+    def has_next_page(self) -> bool:
+        return self.next_page_cursor != ""
+
+    @rx.var
+    def page_selected(self) -> bool:
+        return len(self.pull_requests) > 0 and all(
+            pull_request.id in self.selected_ids for pull_request in self.pull_requests
+        )
 
     def set_repository_url(
         self,
@@ -76,40 +101,130 @@ class State(rx.State):
         self.release_tag_end = value
         print(self.release_tag_end)
 
-    def load_entries(self) -> list[GithubPullRequest]:
-        """Get all users from the database."""
-        with rx.session() as session:
-            query = select(GithubPullRequest)
-            if self.search_value:
-                search_value = f"%{str(self.search_value).lower()}%"
-                query = query.where(
-                    or_(
-                        *[
-                            getattr(GithubPullRequest, field).ilike(search_value)
-                            for field in GithubPullRequest.get_fields()
-                        ],
-                    ),
-                )
-
-            self.pull_requests = session.exec(query).all()
+    def _page_scope(self) -> ReleaseScope | None:
+        """The release the table is restricted to, or None for every stored row."""
+        return self._release if self.show_release else None
+
+    def load_entries(self) -> None:
+        """Get the current page of pull requests from the database."""
+        page = cached_page(
+            str(self.search_value),
+            self.sort_value,
+            self.sort_reverse,
+            self.page_cursor,
+            self._page_scope(),
+        )
+        self.pull_requests = page.pull_requests
+        self.next_page_cursor = page.next_cursor
+
+    def first_page(self) -> None:
+        self.page_cursor = ""
+        self.previous_page_cursors = []
+        self.load_entries()
+
+    def next_page(self) -> None:
+        if not self.next_page_cursor:
+            return
+
+        self.previous_page_cursors.append(self.page_cursor)
+        self.page_cursor = self.next_page_cursor
+        self.load_entries()
+
+    def previous_page(self) -> None:
+        if not self.previous_page_cursors:
+            return
+
+        self.page_cursor = self.previous_page_cursors.pop()
+        self.load_entries()
 
     def sort_values(
         self,
         sort_value: str,
     ) -> None:
         self.sort_value = sort_value
-        self.load_entries()
+        self.first_page()
 
     def toggle_sort(self) -> None:
         self.sort_reverse = not self.sort_reverse
-        self.load_entries()
+        self.first_page()
+
+    def set_show_release(
+        self,
+        show_release: bool,
+    ) -> None:
+        self.show_release = show_release
+        self.first_page()
 
     def filter_values(
         self,
         search_value,
-    ) -> None:
+    ):
         self.search_value = search_value
-        self.load_entries()
+        self._search_generation += 1
+        # The cursors belong to the previous search; paging before this one
+        # lands would apply them to the new one.
+        self.page_cursor = ""
+        self.previous_page_cursors = []
+        self.next_page_cursor = ""
+        running = RUNNING_SEARCHES.pop(self.router.session.client_token, None)
+        if running is not None:
+            running.interrupt()
+        # Taken here rather than when the task starts, by which time a newer
+        # keystroke may already have bumped it.
+        return State.search_after_pause(self._search_generation)
+
+    @rx.background
+    async def search_after_pause(
+        self,
+        generation: int,
+    ):
+        """Run the search once typing pauses, unless a newer keystroke wins.
+
+        Every keystroke starts one of these with its own `generation`; all
+        but the last find it superseded, either after the pause (and never
+        query), during their query (which the newer keystroke interrupts) or
+        after it (and drop the result).
+        """
+        await asyncio.sleep(SEARCH_DEBOUNCE)
+        token = self.router.session.client_token
+        query = InterruptibleQuery()
+        async with self:
+            if generation != self._search_generation:
+                return
+            search = (
+                str(self.search_value),
+                self.sort_value,
+                self.sort_reverse,
+                "",
+                self._page_scope(),
+            )
+            # Registered under the state lock, so a keystroke either sees it
+            # and interrupts it or has already bumped the generation above.
+            RUNNING_SEARCHES[token] = query
+
+        try:
+            # In a worker thread, so newer keystrokes are handled meanwhile.
+            page = await asyncio.to_thread(cached_page, *search, query=query)
+        except QueryInterrupted:
+            return
+        finally:
+            if RUNNING_SEARCHES.get(token) is query:
+                del RUNNING_SEARCHES[token]
+
+        async with self:
+            current = (
+                str(self.search_value),
+                self.sort_value,
+                self.sort_reverse,
+                "",
+                self._page_scope(),
+            )
+            if generation != self._search_generation or current != search:
+                return
+            self.page_cursor = ""
+            self.previous_page_cursors = []
+            self.pull_requests = page.pull_requests
+            self.next_page_cursor = page.next_cursor
 
     def get_pull_request(
         self,
@@ -117,55 +232,163 @@ class State(rx.State):
     ) -> None:
         self.current_pull_request = pull_request
 
-    def delete_pull_request(
+    def toggle_selected(
         self,
         id: int,
+        checked: bool,
+    ) -> None:
+        if checked and id not in self.selected_ids:
+            self.selected_ids.append(id)
+        elif not checked and id in self.selected_ids:
+            self.selected_ids.remove(id)
+
+    def select_page(
+        self,
+        checked: bool,
+    ) -> None:
+        """Select or deselect every pull request on the current page."""
+        page_ids = [pull_request.id for pull_request in self.pull_requests]
+        if checked:
+            self.selected_ids = list(dict.fromkeys(self.selected_ids + page_ids))
+        else:
+            self.selected_ids = [id for id in self.selected_ids if id not in page_ids]
+
+    def clear_selection(self) -> None:
+        self.selected_ids = []
+
+    def set_exclude_author(
+        self,
+        value: str,
+    ) -> None:
+        self.exclude_author = value
+
+    def set_exclude_title_pattern(
+        self,
+        value: str,
+    ) -> None:
+        self.exclude_title_pattern = value
+
+    def _exclude_pull_requests(
+        self,
+        ids: list[int],
     ):
-        """Delete a customer from the database."""
-        with rx.session() as session:
-            pull_request = session.exec(
-                select(GithubPullRequest).where(GithubPullRequest.id == id),
-            ).first()
-            session.delete(pull_request)
-            session.commit()
+        """Exclude `ids` in one transaction, then refresh the table once."""
+        if not ids:
+            return rx.toast.info(
+                "No pull requests to exclude.",
+                position="bottom-right",
+            )
 
-        self.load_entries()
+        with rx.session() as session:
+            excluded = exclude_pull_requests(session, ids)
+
+        PAGE_CACHE.invalidate()
+        removed = set(ids)
+        self.selected_ids = [id for id in self.selected_ids if id not in removed]
+        self._release_pull_requests = [
+            pull_request
+            for pull_request in self._release_pull_requests
+            if pull_request.id not in removed
+        ]
+        self.release_size = len(self._release_pull_requests)
+        self.first_page()
         return rx.toast.info(
-            f"User {pull_request.customer_name} has been deleted.",
+            f"{excluded} pull request{'' if excluded == 1 else 's'} excluded.",
             position="bottom-right",
         )
 
+    def exclude_pull_request(
+        self,
+        id: int,
+    ):
+        """Exclude a pull request from the table and from changelogs."""
+        return self._exclude_pull_requests([id])
+
+    def exclude_selected(self):
+        return self._exclude_pull_requests(list(self.selected_ids))
+
+    def exclude_matching(self):
+        """Exclude the repository's pull requests matching the exclusion rules."""
+        if not self.repository_url:
+            return rx.toast.info(
+                "Enter a repository to exclude pull requests from.",
+                position="bottom-right",
+            )
+
+        with rx.session() as session:
+            ids = matching_pull_request_ids(
+                session,
+                self.repository_url,
+                self.exclude_author,
+                self.exclude_title_pattern,
+            )
+        return self._exclude_pull_requests(ids)
+
     @rx.background
     async def call_openai(self):
-        session = get_openai_client().chat.completions.create(
-            user=self.router.session.client_token,
-            stream=True,
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"You are a product marketer at a developer tool company. You have a list of pull requests within an open source project. Your task is to write a developer-friendly changelog based on the pull requests. The changelog should be {self.tone} and {self.length} characters long.",
-                },
-                {
-                    "role": "user",
-                    "content": f"Based on these {self.pull_requests} write a changelog draft to junior level developer",
-                },
-            ],
-        )
-        for item in session:
-            if hasattr(item.choices[0].delta, "content"):
-                response_text = item.choices[0].delta.content
+        try:
+            key = changelog_cache_key(
+                self._release_pull_requests,
+                MODEL,
+                self.tone,
+                self.length,
+            )
+            if self.use_changelog_cache:
+                with rx.session() as session:
+                    cached = get_cached_changelog(session, key)
+
+                if cached is not None:
+                    async with self:
+                        self.changelog_content_data = cached
+                    return
+
+            chunks = stream_changelog(
+                get_openai_client(),
+                self._release_pull_requests,
+                self.tone,
+                self.length,
+                user=self.router.session.client_token,
+            )
+            # Each flush takes the state lock and pushes one delta to the
+            # client, so tokens are batched rather than sent one by one.
+            parts = []
+            async for text in coalesce(chunks):
+                parts.append(text)
                 async with self:
-                    if response_text is not None:
-                        self.changelog_content_data += response_text
-
-                yield
-
-        async with self:
-            self.gen_response = False
+                    self.changelog_content_data += text
+
+            # Only a complete changelog is cached; a failed stream raised above.
+            content = "".join(parts)
+            if content:
+                with rx.session() as session:
+                    store_changelog(
+                        session,
+                        key,
+                        MODEL,
+                        self.tone,
+                        self.length,
+                        content,
+                    )
+        except Exception as error:
+            print(f"Changelog generation failed: {error!r}")
+            return rx.toast.error(
+                "Generating the changelog failed, please try again.",
+                position="bottom-right",
+            )
+        finally:
+            async with self:
+                self.gen_response = False
 
     def generate_changelog(self):
         self.gen_response = True
+        self.use_changelog_cache = True
+        self.changelog_content_data = ""
+        return State.call_openai
+
+    def regenerate_changelog(self):
+        """Generate a fresh changelog even if one is cached for these inputs."""
+        self.gen_response = True
+        self.use_changelog_cache = False
         self.changelog_content_data = ""
         return State.call_openai
 
@@ -176,32 +399,30 @@ class State(rx.State):
         repo_url: str = self.repository_url
         start_tag: str = self.release_tag_start
         end_tag: str = self.release_tag_end
-        client = get_github_client()
-        repo = client.get_repo(repo_url)
-
-        # Get the commit SHAs for the start and end tags
-        start_commit = repo.get_git_ref(f"tags/{start_tag}").object.sha
-        end_commit = repo.get_git_ref(f"tags/{end_tag}").object.sha
-
-        # Get all pull requests between the two commits
-        pulls = repo.get_pulls(state="closed", sort="created", direction="desc")
-
-        pull_requests = []
-        for pr in pulls:
-            if pr.merge_commit_sha and (
-                repo.compare(start_commit, pr.merge_commit_sha).ahead_by >= 0
-                and repo.compare(pr.merge_commit_sha, end_commit).ahead_by >= 0
-            ):
-                pull_requests.append(
-                    GithubPullRequest(
-                        title=pr.title,
-                        number=pr.number,
-                        body=pr.body,
-                        author=pr.user.login,
-                        merged_at=pr.merged_at,
-                        url=pr.html_url,
-                    ),
-                )
-
-        self.pull_requests = pull_requests
+        with rx.session() as session:
+            pull_requests = stored_pull_requests_between_tags(
+                session,
+                repo_url,
+                start_tag,
+                end_tag,
+            )
+
+        if pull_requests is None:
+            async with get_github_client() as client:
+                with rx.session() as session:
+                    pull_requests = await PullRequestSync(
+                        session,
+                        client,
+                        repo_url,
+                    ).pull_requests_between_tags(start_tag, end_tag)
+
+            print(f"GitHub response cache: {get_github_response_cache().stats}")
+
+        async with self:
+            self._release_pull_requests = pull_requests
+            self._release = ReleaseScope(repo_url, start_tag, end_tag)
+            self.release_size = len(pull_requests)
+            self.show_release = True
+            self.first_page()
+
         return pull_requests
@@ -0,0 +1,278 @@
+"""Headless changelog generation for many repositories and tag ranges.
+
+    python -m changelog_generator.backend.batch manifest.csv
+
+The manifest is a CSV file with `repository,start_tag,end_tag` columns and
+optional `tone` and `length` columns. Entries run as a two-stage pipeline:
+a pool of fetch workers syncs pull requests from GitHub, one repository at a
+time per worker, and hands each range to a separate pool of generation
+workers through a bounded queue. Every entry is checkpointed as a
+`ChangelogJob` row and its changelog is written there (and to the changelog
+cache the app reads), so a rerun skips the entries that are already done.
+
+GitHub and OpenAI are reached through `GITHUB_API_URL` and `OPENAI_BASE_URL`,
+which can point at stub servers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import reflex as rx
+from sqlmodel import select
+
+from .changelog_cache import changelog_cache_key, get_cached_changelog, store_changelog
+from .clients import get_github_client, get_openai_client
+from .generation import MODEL, stream_changelog
+from .github_client import GithubClient
+from .models import ChangelogJob, GithubPullRequest
+from .sync import PullRequestSync, stored_pull_requests_between_tags
+
+if TYPE_CHECKING:
+    import openai
+
+DEFAULT_TONE = "😊 Formal"
+DEFAULT_LENGTH = "1000"
+FETCH_CONCURRENCY = 4
+GENERATE_CONCURRENCY = 4
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    repository: str
+    start_tag: str
+    end_tag: str
+    tone: str = DEFAULT_TONE
+    length: str = DEFAULT_LENGTH
+
+
+def read_manifest(
+    path: str,
+) -> list[ManifestEntry]:
+    with open(path, newline="") as f:
+        return [
+            ManifestEntry(
+                repository=row["repository"].strip(),
+                start_tag=row["start_tag"].strip(),
+                end_tag=row["end_tag"].strip(),
+                tone=(row.get("tone") or DEFAULT_TONE).strip(),
+                length=(row.get("length") or DEFAULT_LENGTH).strip(),
+            )
+            for row in csv.DictReader(f)
+            if row["repository"] and not row["repository"].startswith("#")
+        ]
+
+
+def _checkpoint(
+    entries: list[ManifestEntry],
+) -> list[ChangelogJob]:
+    """Record a job for every new entry and return the jobs not done yet."""
+    with rx.session() as session:
+        jobs = []
+        for entry in dict.fromkeys(entries):
+            job = session.exec(
+                select(ChangelogJob).where(
+                    ChangelogJob.repository == entry.repository,
+                    ChangelogJob.start_tag == entry.start_tag,
+                    ChangelogJob.end_tag == entry.end_tag,
+                    ChangelogJob.tone == entry.tone,
+                    ChangelogJob.length == entry.length,
+                ),
+            ).first()
+            if job is None:
+                job = ChangelogJob(
+                    repository=entry.repository,
+                    start_tag=entry.start_tag,
+                    end_tag=entry.end_tag,
+                    tone=entry.tone,
+                    length=entry.length,
+                    updated_at=time.time(),
+                )
+                session.add(job)
+            jobs.append(job)
+
+        session.commit()
+        for job in jobs:
+            session.refresh(job)
+        return [job for job in jobs if job.status != "done"]
+
+
+def _finish(
+    job: ChangelogJob,
+    status: str,
+    **fields,
+) -> None:
+    with rx.session() as session:
+        stored = session.get(ChangelogJob, job.id)
+        stored.status = status
+        for name, value in fields.items():
+            setattr(stored, name, value)
+
+        stored.updated_at = time.time()
+        session.add(stored)
+        session.commit()
+
+    print(
+        f"{status}: {job.repository} {job.start_tag}..{job.end_tag} {fields.get('error', '')}".rstrip()
+    )
+
+
+async def _fetch(
+    client: GithubClient,
+    job: ChangelogJob,
+) -> list[GithubPullRequest]:
+    with rx.session() as session:
+        pull_requests = stored_pull_requests_between_tags(
+            session,
+            job.repository,
+            job.start_tag,
+            job.end_tag,
+        )
+        if pull_requests is None:
+            pull_requests = await PullRequestSync(
+                session,
+                client,
+                job.repository,
+            ).pull_requests_between_tags(job.start_tag, job.end_tag)
+
+    return pull_requests
+
+
+async def _generate(
+    client: openai.AsyncOpenAI,
+    job: ChangelogJob,
+    pull_requests: list[GithubPullRequest],
+) -> str:
+    key = changelog_cache_key(pull_requests, MODEL, job.tone, job.length)
+    with rx.session() as session:
+        cached = get_cached_changelog(session, key)
+    if cached is not None:
+        return cached
+
+    parts = [
+        text
+        async for text in stream_changelog(
+            client,
+            pull_requests,
+            job.tone,
+            job.length,
+            user="batch",
+        )
+    ]
+    content = "".join(parts)
+    with rx.session() as session:
+        store_changelog(session, key, MODEL, job.tone, job.length, content)
+    return content
+
+
+async def _fetch_worker(
+    client: GithubClient,
+    repositories: asyncio.Queue,
+    ready: asyncio.Queue,
+) -> None:
+    """Sync one repository's ranges at a time, so its sync state is never raced."""
+    while not repositories.empty():
+        jobs = repositories.get_nowait()
+        for job in jobs:
+            try:
+                pull_requests = await _fetch(client, job)
+            except Exception as error:
+                _finish(job, "failed", error=f"fetch: {error!r}")
+                continue
+
+            if not pull_requests:
+                _finish(job, "done", pull_request_count=0, content="")
+                continue
+
+            # Blocks while the generation stage is saturated.
+            await ready.put((job, pull_requests))
+
+
+async def _generate_worker(
+    client: openai.AsyncOpenAI,
+    ready: asyncio.Queue,
+) -> None:
+    while (item := await ready.get()) is not None:
+        job, pull_requests = item
+        try:
+            content = await _generate(client, job, pull_requests)
+        except Exception as error:
+            _finish(job, "failed", error=f"generate: {error!r}")
+        else:
+            _finish(job, "done", pull_request_count=len(pull_requests), content=content)
+
+
+async def run_batch(
+    entries: list[ManifestEntry],
+    fetch_concurrency: int = FETCH_CONCURRENCY,
+    generate_concurrency: int = GENERATE_CONCURRENCY,
+) -> dict[str, int]:
+    """Run every pending entry; returns the number of jobs per final status."""
+    jobs = _checkpoint(entries)
+    by_repository = defaultdict(list)
+    for job in jobs:
+        by_repository[job.repository].append(job)
+
+    repositories: asyncio.Queue = asyncio.Queue()
+    for repository_jobs in by_repository.values():
+        repositories.put_nowait(repository_jobs)
+    ready: asyncio.Queue = asyncio.Queue(maxsize=generate_concurrency)
+
+    openai_client = get_openai_client()
+    async with get_github_client() as github_client:
+        generators = [
+            asyncio.create_task(_generate_worker(openai_client, ready))
+            for _ in range(generate_concurrency)
+        ]
+        await asyncio.gather(
+            *[
+                _fetch_worker(github_client, repositories, ready)
+                for _ in range(fetch_concurrency)
+            ],
+        )
+        for _ in generators:
+            await ready.put(None)
+        await asyncio.gather(*generators)
+
+    with rx.session() as session:
+        statuses = session.exec(
+            select(ChangelogJob.status).where(
+                ChangelogJob.id.in_([job.id for job in jobs]),
+            ),
+        ).all()
+    return {status: statuses.count(status) for status in set(statuses)}
+
+
+def main(
+    argv: list[str] | None = None,
+) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "manifest", help="CSV with repository,start_tag,end_tag[,tone,length]"
+    )
+    parser.add_argument("--fetch-concurrency", type=int, default=FETCH_CONCURRENCY)
+    parser.add_argument(
+        "--generate-concurrency", type=int, default=GENERATE_CONCURRENCY
+    )
+    args = parser.parse_args(argv)
+
+    counts = asyncio.run(
+        run_batch(
+            read_manifest(args.manifest),
+            args.fetch_concurrency,
+            args.generate_concurrency,
+        ),
+    )
+    print(f"Batch finished: {counts}")
+    return 1 if counts.get("failed") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+
+from sqlmodel import Session, col, delete, func, select
+
+from .models import GeneratedChangelog, GithubPullRequest
+from .prompts import serialize_pull_request
+
+CACHE_TTL = 7 * 24 * 60 * 60
+CACHE_MAX_ENTRIES = 500
+
+
+def changelog_cache_key(
+    pull_requests: list[GithubPullRequest],
+    model: str,
+    tone: str,
+    length: str,
+) -> str:
+    """Hash everything that determines a generated changelog.
+
+    Pull requests are normalized to the exact text sent to the model and put
+    in a fixed order, so the same release fetched twice hashes the same.
+    """
+    ordered = sorted(
+        pull_requests,
+        key=lambda pull_request: (pull_request.repository, pull_request.number),
+    )
+    payload = json.dumps(
+        {
+            "model": model,
+            "tone": tone,
+            "length": length,
+            "pull_requests": [serialize_pull_request(pr) for pr in ordered],
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_cached_changelog(
+    session: Session,
+    key: str,
+) -> str | None:
+    entry = session.exec(
+        select(GeneratedChangelog).where(GeneratedChangelog.key == key),
+    ).first()
+    if entry is None:
+        return None
+
+    now = time.time()
+    if entry.created_at < now - CACHE_TTL:
+        session.delete(entry)
+        session.commit()
+        return None
+
+    entry.used_at = now
+    session.add(entry)
+    session.commit()
+    return entry.content
+
+
+def store_changelog(
+    session: Session,
+    key: str,
+    model: str,
+    tone: str,
+    length: str,
+    content: str,
+) -> None:
+    """Store a generated changelog, then evict expired and excess entries.
+
+    Beyond `CACHE_MAX_ENTRIES`, the least recently used entries go first.
+    """
+    now = time.time()
+    session.exec(delete(GeneratedChangelog).where(GeneratedChangelog.key == key))
+    session.add(
+        GeneratedChangelog(
+            key=key,
+            model=model,
+            tone=tone,
+            length=length,
+            content=content,
+            created_at=now,
+            used_at=now,
+        ),
+    )
+    session.exec(
+        delete(GeneratedChangelog).where(
+            GeneratedChangelog.created_at < now - CACHE_TTL
+        ),
+    )
+    session.flush()
+
+    excess = (
+        session.exec(select(func.count(GeneratedChangelog.id))).one()
+        - CACHE_MAX_ENTRIES
+    )
+    if excess > 0:
+        least_recent = (
+            select(GeneratedChangelog.id)
+            .order_by(GeneratedChangelog.used_at)
+            .limit(excess)
+        )
+        session.exec(
+            delete(GeneratedChangelog).where(
+                col(GeneratedChangelog.id).in_(least_recent)
+            ),
+        )
+
+    session.commit()
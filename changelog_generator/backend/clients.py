@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+from .github_cache import ResponseCache
+from .github_client import GITHUB_API_URL, GithubClient, RateLimitScheduler
+
+if TYPE_CHECKING:
+    import openai
+
+# Clients are created on first use: the OpenAI SDK alone takes most of a
+# second to import, which every app worker and hot reload would pay.
+CLIENT_OPEN_AI = None
+GITHUB_RESPONSE_CACHE = None
+
+# The rate limit belongs to the token, so every client shares one scheduler.
+GITHUB_RATE_LIMIT = RateLimitScheduler()
+
+
+def get_github_response_cache() -> ResponseCache:
+    global GITHUB_RESPONSE_CACHE
+    if GITHUB_RESPONSE_CACHE is None:
+        GITHUB_RESPONSE_CACHE = ResponseCache(
+            os.environ.get("GITHUB_CACHE_PATH", "github_cache.db"),
+            max_bytes=int(
+                os.environ.get("GITHUB_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+            ),
+        )
+
+    return GITHUB_RESPONSE_CACHE
+
+
+def get_github_client() -> GithubClient:
+    github_token = os.environ.get("GITHUB_TOKEN")
+    if not github_token:
+        raise ValueError("GITHUB_TOKEN environment variable is not set")
+
+    return GithubClient(
+        github_token,
+        base_url=os.environ.get("GITHUB_API_URL", GITHUB_API_URL),
+        max_concurrency=int(os.environ.get("GITHUB_MAX_CONCURRENCY", "8")),
+        rate_limit=GITHUB_RATE_LIMIT,
+        cache=get_github_response_cache(),
+    )
+
+
+def get_openai_client() -> openai.AsyncOpenAI:
+    global CLIENT_OPEN_AI
+    if CLIENT_OPEN_AI is None:
+        import openai
+
+        CLIENT_OPEN_AI = openai.AsyncOpenAI(
+            api_key=os.environ["OPENAI_API_KEY"],
+            # Unset means the public API; set it to point at a stub or proxy.
+            base_url=os.environ.get("OPENAI_BASE_URL") or None,
+        )
+
+    return CLIENT_OPEN_AI
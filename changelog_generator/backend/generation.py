@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, AsyncIterator
+
+from .models import GithubPullRequest
+from .prompts import (
+    changelog_messages,
+    count_message_tokens,
+    count_tokens,
+    pack_batches,
+    serialize_pull_request,
+    summary_messages,
+)
+from .streaming import iter_completion_text
+
+if TYPE_CHECKING:
+    import openai
+
+MODEL = "gpt-3.5-turbo"
+CONTEXT_TOKENS = 16_385
+# Room for the answer; the longest changelog asked for is 1500 characters.
+CHANGELOG_MAX_TOKENS = 1_500
+SUMMARY_MAX_TOKENS = 500
+# Tokens of pull request text a summary request carries at most, so large
+# releases are summarized in several concurrent requests.
+SUMMARY_BATCH_TOKENS = 10_000
+MAX_CONCURRENT_SUMMARIES = 4
+
+
+async def _summarize(
+    client: openai.AsyncOpenAI,
+    batch: list[str],
+    semaphore: asyncio.Semaphore,
+    user: str,
+) -> str:
+    async with semaphore:
+        completion = await client.chat.completions.create(
+            user=user,
+            model=MODEL,
+            max_tokens=SUMMARY_MAX_TOKENS,
+            messages=summary_messages("\n".join(batch)),
+        )
+    return completion.choices[0].message.content or ""
+
+
+def _changelog_budget(
+    tone: str,
+    length: str,
+) -> int:
+    """Tokens of pull requests or summaries the final request can carry.
+
+    What is left of the context once the instructions and the answer are
+    accounted for.
+    """
+    instructions = max(
+        count_message_tokens(changelog_messages("", tone, length, merge=merge))
+        for merge in (False, True)
+    )
+    return CONTEXT_TOKENS - CHANGELOG_MAX_TOKENS - instructions
+
+
+async def _reduce(
+    client: openai.AsyncOpenAI,
+    items: list[str],
+    budget: int,
+    user: str,
+) -> tuple[list[str], bool]:
+    """Summarize `items` batch by batch until they fit in `budget` tokens.
+
+    Returns the items to prompt with and whether they are summaries.
+    """
+    batch_tokens = min(
+        SUMMARY_BATCH_TOKENS,
+        CONTEXT_TOKENS
+        - SUMMARY_MAX_TOKENS
+        - count_message_tokens(summary_messages("")),
+    )
+    summarized = False
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SUMMARIES)
+    while count_tokens("\n".join(items)) > budget and len(items) > 1:
+        batches = pack_batches(items, batch_tokens)
+        items = await asyncio.gather(
+            *[_summarize(client, batch, semaphore, user) for batch in batches],
+        )
+        summarized = True
+    return items, summarized
+
+
+async def stream_changelog(
+    client: openai.AsyncOpenAI,
+    pull_requests: list[GithubPullRequest],
+    tone: str,
+    length: str,
+    user: str = "",
+) -> AsyncIterator[str]:
+    """Stream a changelog for `pull_requests`.
+
+    Releases that fit the prompt budget are written in one request. Larger
+    ones are split into batches that are summarized concurrently, and the
+    final changelog is written from the merged summaries.
+    """
+    items, summarized = await _reduce(
+        client,
+        [serialize_pull_request(pull_request) for pull_request in pull_requests],
+        _changelog_budget(tone, length),
+        user,
+    )
+    stream = await client.chat.completions.create(
+        user=user,
+        stream=True,
+        model=MODEL,
+        max_tokens=CHANGELOG_MAX_TOKENS,
+        messages=changelog_messages("\n".join(items), tone, length, merge=summarized),
+    )
+    async for text in iter_completion_text(stream):
+        yield text
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: str | None
+    last_modified: str | None
+    content_type: str
+    body: bytes
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """On-disk store of GitHub responses for conditional requests.
+
+    Bodies are kept per URL together with their `ETag`/`Last-Modified`
+    validators. When GitHub answers a revalidation with `304 Not Modified`
+    the stored body is reused, and the request does not count against the
+    rate limit. The least recently used entries are evicted once the stored
+    bodies exceed `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS response (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                used_at REAL NOT NULL
+            )
+            """,
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS response_used_at ON response (used_at)",
+        )
+        self._connection.commit()
+        # Running total of the stored bodies, so that storing a response does
+        # not sum the whole table.
+        self._total_bytes = self._stored_bytes()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters; every hit is one request not charged to the budget."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def get(
+        self,
+        url: str,
+    ) -> CachedResponse | None:
+        row = self._connection.execute(
+            "SELECT etag, last_modified, content_type, body FROM response WHERE url = ?",
+            (url,),
+        ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def record_hit(
+        self,
+        url: str,
+    ) -> None:
+        self.hits += 1
+        with self._connection:
+            self._connection.execute(
+                "UPDATE response SET used_at = ? WHERE url = ?",
+                (time.time(), url),
+            )
+
+    def record_miss(
+        self,
+        url: str,
+        etag: str | None,
+        last_modified: str | None,
+        content_type: str,
+        body: bytes,
+    ) -> None:
+        self.misses += 1
+        if not etag and not last_modified:
+            return
+
+        with self._connection:
+            replaced = self._connection.execute(
+                "SELECT size FROM response WHERE url = ?",
+                (url,),
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO response VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, content_type, body, len(body), time.time()),
+            )
+            self._total_bytes += len(body) - (replaced[0] if replaced else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _stored_bytes(self) -> int:
+        (total,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM response",
+        ).fetchone()
+        return total
+
+    def _evict(self) -> None:
+        # Another process may share the file, so recount before evicting.
+        total = self._stored_bytes()
+        if total <= self.max_bytes:
+            self._total_bytes = total
+            return
+
+        # Walk from least recently used, dropping entries until under budget.
+        excess = total - self.max_bytes
+        stale = []
+        for url, size in self._connection.execute(
+            "SELECT url, size FROM response ORDER BY used_at",
+        ):
+            if excess <= 0:
+                break
+            stale.append((url,))
+            excess -= size
+
+        self._connection.executemany("DELETE FROM response WHERE url = ?", stale)
+        self._total_bytes = self.max_bytes + excess
+
+    def close(self) -> None:
+        self._connection.close()
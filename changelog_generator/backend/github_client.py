@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from .github_cache import ResponseCache
+
+if TYPE_CHECKING:
+    import httpx
+
+GITHUB_API_URL = "https://api.github.com"
+PER_PAGE = 100
+
+
+class RateLimitScheduler:
+    """Paces requests from the `X-RateLimit-*` headers of earlier responses.
+
+    While plenty of budget is left requests go out immediately. Once less than
+    `pace_below` requests remain, they are spread evenly over the time left
+    until the window resets, and once only `reserve` remain they wait for the
+    reset itself. Pacing is global: each request reserves the next free slot
+    and counts against `remaining` as it goes out, so concurrent requests are
+    spread out instead of all waiting the same delay and firing together.
+    """
+
+    def __init__(
+        self,
+        reserve: int = 10,
+        pace_below: int = 500,
+    ) -> None:
+        self.reserve = reserve
+        self.pace_below = pace_below
+        self.remaining: int | None = None
+        self.reset_at: float = 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    def update(
+        self,
+        headers: httpx.Headers,
+    ) -> None:
+        reset_at = float(headers.get("x-ratelimit-reset", self.reset_at))
+        if "x-ratelimit-remaining" in headers:
+            remaining = int(headers["x-ratelimit-remaining"])
+            # Within a window, responses arriving out of order must not give
+            # back budget already counted for requests still in flight.
+            if self.remaining is not None and reset_at == self.reset_at:
+                remaining = min(remaining, self.remaining)
+            self.remaining = remaining
+        self.reset_at = reset_at
+
+    def delay(self) -> float:
+        window = self.reset_at - time.time()
+        if self.remaining is None or window <= 0:
+            return 0.0
+        if self.remaining <= self.reserve:
+            return window
+        if self.remaining < self.pace_below:
+            return window / (self.remaining - self.reserve)
+        return 0.0
+
+    async def wait(self) -> None:
+        """Reserve the next slot, `delay()` after the previous one, and sleep until it."""
+        async with self._lock:
+            now = time.time()
+            slot = max(self._next_slot, now) + self.delay()
+            self._next_slot = slot
+            if self.remaining is not None:
+                self.remaining -= 1
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class GithubClient:
+    """Async access to the GitHub REST API over a pooled HTTP connection.
+
+    Every request first waits for its slot from the shared `rate_limit`
+    scheduler, and at most `max_concurrency` are in flight at once. With a `cache`, requests
+    are sent conditionally and `304 Not Modified` answers are served from it.
+    Use it as an async context manager so the connection pool is closed
+    afterwards.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        base_url: str = GITHUB_API_URL,
+        max_concurrency: int = 8,
+        rate_limit: RateLimitScheduler | None = None,
+        cache: ResponseCache | None = None,
+        max_retries: int = 3,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit or RateLimitScheduler()
+        self.cache = cache
+        self.max_retries = max_retries
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Imported on first use, so that starting the app does not load httpx.
+        import httpx
+
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            headers={
+                "Accept": "application/vnd.github+json",
+                "Authorization": f"Bearer {token}",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+            timeout=30.0,
+        )
+
+    async def __aenter__(self) -> GithubClient:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def get(
+        self,
+        path: str,
+        params: dict[str, Any] | None = None,
+    ) -> httpx.Response:
+        request = self._http.build_request("GET", path, params=params)
+        url = str(request.url)
+        cached = self.cache.get(url) if self.cache else None
+        if cached:
+            request.headers.update(cached.conditional_headers())
+
+        for _ in range(self.max_retries):
+            # Paced before taking a connection slot, so waiting requests do
+            # not hold one.
+            await self.rate_limit.wait()
+            async with self._semaphore:
+                response = await self._http.send(request)
+
+            self.rate_limit.update(response.headers)
+            if not self._is_rate_limited(response):
+                break
+
+            await asyncio.sleep(self._retry_after(response))
+
+        if cached and response.status_code == 304:
+            import httpx
+
+            self.cache.record_hit(url)
+            return httpx.Response(
+                200,
+                headers={"Content-Type": cached.content_type},
+                content=cached.body,
+                request=request,
+            )
+
+        response.raise_for_status()
+        if self.cache:
+            self.cache.record_miss(
+                url,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+                content_type=response.headers.get("content-type", ""),
+                body=response.content,
+            )
+        return response
+
+    async def get_json(
+        self,
+        path: str,
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        return (await self.get(path, params)).json()
+
+    async def iter_pages(
+        self,
+        path: str,
+        params: dict[str, Any] | None = None,
+    ) -> AsyncIterator[list[Any]]:
+        """Yield the pages of a list endpoint in order.
+
+        Pages are requested in concurrent windows that double up to
+        `max_concurrency`, so callers that stop after the first page do not
+        pay for speculative requests. Iteration ends at the first short page.
+        """
+        page = 1
+        window = 1
+        while True:
+            results = await asyncio.gather(
+                *[
+                    self.get_json(
+                        path,
+                        {**(params or {}), "per_page": PER_PAGE, "page": number},
+                    )
+                    for number in range(page, page + window)
+                ],
+            )
+            for items in results:
+                if items:
+                    yield items
+                if len(items) < PER_PAGE:
+                    return
+
+            page += window
+            window = min(window * 2, self.max_concurrency)
+
+    @staticmethod
+    def _is_rate_limited(
+        response: httpx.Response,
+    ) -> bool:
+        return response.status_code == 429 or (
+            response.status_code == 403
+            and response.headers.get("x-ratelimit-remaining") == "0"
+        )
+
+    def _retry_after(
+        self,
+        response: httpx.Response,
+    ) -> float:
+        if "retry-after" in response.headers:
+            return float(response.headers["retry-after"])
+        return max(self.rate_limit.reset_at - time.time(), 1.0)
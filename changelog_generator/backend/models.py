@@ -1,14 +1,138 @@
+from typing import Optional
+
 import reflex as rx
+import sqlalchemy as sa
+from sqlmodel import Field
 
 
 class GithubPullRequest(
     rx.Model,
     table=True,
 ):  # type: ignore
+    """A merged pull request; `(repository, number)` identifies it."""
+
+    __table_args__ = (
+        sa.Index(
+            "ix_githubpullrequest_repository_number",
+            "repository",
+            "number",
+            unique=True,
+        ),
+    )
 
     title: str
     number: int
     body: str
-    author: str
-    merged_at: str
+    author: str = Field(index=True)
+    merged_at: str = Field(index=True)
     url: str
+    repository: str = ""
+    merge_commit_sha: Optional[str] = None
+    # Left out of the table and changelogs; kept so that a resync, which
+    # upserts the pull request again, does not bring it back.
+    excluded: bool = Field(
+        default=False, sa_column_kwargs={"server_default": sa.false()}
+    )
+
+
+class GithubSyncState(
+    rx.Model,
+    table=True,
+):  # type: ignore
+    """How much of a repository's merged pull request history is stored.
+
+    Every pull request merged between `synced_from` and `synced_until` is in
+    the `GithubPullRequest` table; `last_merged_at` is the high-water mark the
+    next sync resumes from.
+    """
+
+    repository: str
+    synced_from: str
+    synced_until: str
+    last_merged_at: str = ""
+
+
+class GithubReleaseRange(
+    rx.Model,
+    table=True,
+):  # type: ignore
+    """A resolved `start_tag`..`end_tag` range and the commits it contains."""
+
+    repository: str
+    start_tag: str
+    end_tag: str
+    start_sha: str
+    end_sha: str
+    start_committed_at: str
+    end_committed_at: str
+    commit_shas: str
+
+
+class GithubTag(
+    rx.Model,
+    table=True,
+):  # type: ignore
+    """The commit a repository's tag resolved to."""
+
+    __table_args__ = (
+        sa.Index(
+            "ix_githubtag_repository_name",
+            "repository",
+            "name",
+            unique=True,
+        ),
+    )
+
+    repository: str
+    name: str
+    sha: str
+    committed_at: str
+
+
+class GeneratedChangelog(
+    rx.Model,
+    table=True,
+):  # type: ignore
+    """A generated changelog, stored under a hash of everything it came from."""
+
+    key: str = Field(unique=True, index=True)
+    model: str
+    tone: str
+    length: str
+    content: str
+    created_at: float
+    used_at: float
+
+
+class ChangelogJob(
+    rx.Model,
+    table=True,
+):  # type: ignore
+    """One manifest entry of a batch run and, once done, its changelog.
+
+    Rows persist across runs, so an interrupted batch resumes with the
+    entries that are not `done` yet.
+    """
+
+    __table_args__ = (
+        sa.Index(
+            "ix_changelogjob_entry",
+            "repository",
+            "start_tag",
+            "end_tag",
+            "tone",
+            "length",
+            unique=True,
+        ),
+    )
+
+    repository: str
+    start_tag: str
+    end_tag: str
+    tone: str
+    length: str
+    status: str = "pending"
+    pull_request_count: int = 0
+    content: str = ""
+    error: str = ""
+    updated_at: float = 0.0
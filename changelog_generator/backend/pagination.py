@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import reflex as rx
+import sqlalchemy as sa
+from sqlmodel import Session
+
+from .models import GithubPullRequest, GithubReleaseRange
+from .search import filter_pull_requests
+
+PAGE_SIZE = 25
+SORTABLE_COLUMNS = ("number", "title", "author", "merged_at")
+PAGE_CACHE_SIZE = 256
+# Bounds how long a write from another process (e.g. the batch runner) can go
+# unnoticed; writes made here invalidate the cache right away.
+PAGE_CACHE_TTL = 30.0
+
+
+@dataclass(frozen=True)
+class ReleaseScope:
+    """A stored `start_tag`..`end_tag` range of `repository`."""
+
+    repository: str
+    start_tag: str
+    end_tag: str
+
+
+@dataclass(frozen=True)
+class Page:
+    pull_requests: list[GithubPullRequest]
+    # Cursor of the page after this one, or "" if this is the last page.
+    next_cursor: str
+
+
+def fetch_page(
+    session: Session,
+    search_value: str,
+    sort_value: str,
+    sort_reverse: bool,
+    cursor: str = "",
+    page_size: int = PAGE_SIZE,
+    release: ReleaseScope | None = None,
+) -> Page:
+    """Fetch one page of stored pull requests by keyset pagination.
+
+    Rows are ordered by `sort_value` (best search match first when searching
+    without one, otherwise insertion order) with the id as tie-breaker. A
+    cursor is the JSON-encoded `[sort key, id]` of the last row of the
+    previous page, so each page is an index seek past it instead of an
+    `OFFSET` that rescans every earlier row. `release` restricts the pages
+    to the pull requests of a stored release range.
+    """
+    # A plain SQLAlchemy select yields (row, sort key) pairs once the sort key
+    # is added; sqlmodel's select would keep returning bare rows.
+    query = sa.select(GithubPullRequest).where(sa.not_(GithubPullRequest.excluded))
+    rank = None
+    if release is not None:
+        query = _in_release(query, release)
+    if search_value:
+        query, rank = filter_pull_requests(
+            query,
+            search_value,
+            session.get_bind().dialect.name,
+        )
+
+    if sort_value in SORTABLE_COLUMNS:
+        sort_key = getattr(GithubPullRequest, sort_value)
+    elif rank is not None:
+        sort_key = rank
+    else:
+        sort_key = GithubPullRequest.id
+
+    query = query.add_columns(sort_key)
+    keyset = sa.tuple_(sort_key, GithubPullRequest.id)
+    if cursor:
+        after = sa.tuple_(*[sa.literal(value) for value in json.loads(cursor)])
+        query = query.where(keyset < after if sort_reverse else keyset > after)
+
+    if sort_reverse:
+        query = query.order_by(sort_key.desc(), GithubPullRequest.id.desc())
+    else:
+        query = query.order_by(sort_key, GithubPullRequest.id)
+
+    rows = session.exec(query.limit(page_size + 1)).all()
+    next_cursor = ""
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last, last_key = rows[-1]
+        next_cursor = json.dumps([last_key, last.id])
+
+    return Page(
+        pull_requests=[pull_request for pull_request, _ in rows],
+        next_cursor=next_cursor,
+    )
+
+
+def _in_release(
+    query: sa.Select,
+    release: ReleaseScope,
+) -> sa.Select:
+    """Restrict `query` the way `sync` selects a range's pull requests.
+
+    Those merged between the range's tags whose merge commit is one of its
+    commits, matched against the stored range in SQL, so the query binds the
+    same few parameters however large the release is.
+    """
+    release_range = (
+        sa.select(GithubReleaseRange)
+        .where(
+            GithubReleaseRange.repository == release.repository,
+            GithubReleaseRange.start_tag == release.start_tag,
+            GithubReleaseRange.end_tag == release.end_tag,
+        )
+        .limit(1)
+        .subquery()
+    )
+    return query.join(
+        release_range,
+        sa.and_(
+            GithubPullRequest.repository == release.repository,
+            GithubPullRequest.merged_at.between(
+                release_range.c.start_committed_at,
+                release_range.c.end_committed_at,
+            ),
+            release_range.c.commit_shas.contains(GithubPullRequest.merge_commit_sha),
+        ),
+    )
+
+
+class PageCache:
+    """Recently fetched pages, keyed by (search, sort, direction, cursor, release).
+
+    Shared by every session of the app process, so many people paging and
+    searching the same table hit the database once per distinct page.
+    `invalidate()` bumps the version after pull requests are inserted or
+    deleted; a page fetched while that happened is not stored, since it may
+    already be stale.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = PAGE_CACHE_SIZE,
+        ttl: float = PAGE_CACHE_TTL,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[float, Page]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: tuple,
+    ) -> Page | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(
+        self,
+        key: tuple,
+        page: Page,
+        version: int,
+    ) -> None:
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = (time.monotonic(), page)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+PAGE_CACHE = PageCache()
+
+
+class QueryInterrupted(Exception):
+    """The query of a `cached_page` call was stopped through its `InterruptibleQuery`."""
+
+
+class InterruptibleQuery:
+    """Lets another thread stop the database query of one `cached_page` call.
+
+    `interrupt()` aborts the statement running on the call's connection
+    (`sqlite3.Connection.interrupt`, or `cancel` on drivers such as psycopg),
+    and makes a call that has not reached the database yet give up before it
+    does. Either way the call raises `QueryInterrupted`.
+    """
+
+    def __init__(self) -> None:
+        self.interrupted = False
+        self._stop = None
+        self._lock = threading.Lock()
+
+    def attach(
+        self,
+        connection,
+    ) -> None:
+        with self._lock:
+            if self.interrupted:
+                raise QueryInterrupted
+            self._stop = getattr(connection, "interrupt", None) or getattr(
+                connection, "cancel", None
+            )
+
+    def detach(self) -> None:
+        with self._lock:
+            self._stop = None
+
+    def interrupt(self) -> None:
+        # Under the lock, so the connection is never interrupted after it has
+        # gone back to the pool and may be running someone else's query.
+        with self._lock:
+            self.interrupted = True
+            if self._stop is not None:
+                self._stop()
+
+
+def cached_page(
+    search_value: str,
+    sort_value: str,
+    sort_reverse: bool,
+    cursor: str = "",
+    release: ReleaseScope | None = None,
+    query: InterruptibleQuery | None = None,
+) -> Page:
+    """`fetch_page` in its own session, served from `PAGE_CACHE` when possible.
+
+    With a `query`, the database query can be interrupted from another thread.
+    """
+    key = (search_value, sort_value, sort_reverse, cursor, release)
+    page = PAGE_CACHE.get(key)
+    if page is not None:
+        return page
+
+    version = PAGE_CACHE.version
+    with rx.session() as session:
+        if query is not None:
+            query.attach(session.connection().connection.dbapi_connection)
+        try:
+            page = fetch_page(
+                session,
+                search_value,
+                sort_value,
+                sort_reverse,
+                cursor,
+                release=release,
+            )
+        except sa.exc.DBAPIError as error:
+            if query is not None and query.interrupted:
+                raise QueryInterrupted from error
+            raise
+        finally:
+            if query is not None:
+                query.detach()
+    PAGE_CACHE.put(key, page, version)
+    return page
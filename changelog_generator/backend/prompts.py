@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import math
+import re
+from typing import Iterable
+
+from .models import GithubPullRequest
+
+BODY_CHARS = 600
+# English prose averages about 4 characters per token, but code, URLs and
+# non-Latin text run much denser; 2 keeps the estimate on the safe side.
+CHARS_PER_TOKEN = 2
+# Tokens each chat message costs on top of its content.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SYSTEM_PROMPT = (
+    "You are a product marketer at a developer tool company. You have a list of "
+    "pull requests within an open source project. Your task is to write a "
+    "developer-friendly changelog based on the pull requests. The changelog "
+    "should be {tone} and {length} characters long."
+)
+CHANGELOG_PROMPT = (
+    "Based on these pull requests write a changelog draft to junior level "
+    "developer:\n\n{pull_requests}"
+)
+MERGE_PROMPT = (
+    "Based on these notes, each summarizing part of the release's pull "
+    "requests, write a changelog draft to junior level developer:\n\n{summaries}"
+)
+SUMMARY_PROMPT = (
+    "Summarize the user-facing changes in these pull requests as terse bullet "
+    "points for a changelog writer. Keep PR numbers and authors, drop "
+    "internal-only details.\n\n{pull_requests}"
+)
+
+_HTML_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def serialize_pull_request(
+    pull_request: GithubPullRequest,
+    body_chars: int = BODY_CHARS,
+) -> str:
+    """Render a pull request as one compact prompt line.
+
+    Only the fields that say what changed are kept; template comments and
+    whitespace runs are stripped from the body, which is then truncated.
+    """
+    body = _WHITESPACE.sub(" ", _HTML_COMMENT.sub("", pull_request.body or "")).strip()
+    if len(body) > body_chars:
+        body = body[:body_chars].rstrip() + "..."
+
+    line = f"#{pull_request.number} {pull_request.title} (@{pull_request.author})"
+    return f"{line}: {body}" if body else line
+
+
+def count_tokens(
+    text: str,
+) -> int:
+    """Estimate the tokens in `text` for OpenAI's BPE tokenizers.
+
+    Uses a conservative characters-per-token ratio rather than a real
+    tokenizer, whose vocabulary would be downloaded on first use, so it
+    overestimates rather than overflows the context.
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def count_message_tokens(
+    messages: list[dict[str, str]],
+) -> int:
+    return sum(
+        count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
+
+
+def pack_batches(
+    items: Iterable[str],
+    budget: int,
+) -> list[list[str]]:
+    """Group `items` in order into batches of at most `budget` tokens.
+
+    An item larger than the budget on its own still gets a batch to itself.
+    """
+    batches: list[list[str]] = []
+    batch: list[str] = []
+    used = 0
+    for item in items:
+        tokens = count_tokens(item) + 1
+        if batch and used + tokens > budget:
+            batches.append(batch)
+            batch = []
+            used = 0
+        batch.append(item)
+        used += tokens
+
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def changelog_messages(
+    content: str,
+    tone: str,
+    length: str,
+    merge: bool = False,
+) -> list[dict[str, str]]:
+    prompt = (
+        MERGE_PROMPT.format(summaries=content)
+        if merge
+        else CHANGELOG_PROMPT.format(pull_requests=content)
+    )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT.format(tone=tone, length=length)},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def summary_messages(
+    content: str,
+) -> list[dict[str, str]]:
+    return [{"role": "user", "content": SUMMARY_PROMPT.format(pull_requests=content)}]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlmodel import Session, col, func, or_, select
+
+from .models import GithubPullRequest
+
+# Ids bound per `IN (...)`, well under SQLite's variable limit.
+EXCLUDE_BATCH_SIZE = 500
+
+
+def title_pattern_like(
+    pattern: str,
+) -> str:
+    """Turn a glob such as `Bump *` into a `LIKE` pattern.
+
+    `*` matches any run of characters and `?` a single one; `%` and `_` in
+    the input match only themselves.
+    """
+    escaped = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped.replace("*", "%").replace("?", "_")
+
+
+def matching_pull_request_ids(
+    session: Session,
+    repository: str,
+    author: str = "",
+    title_pattern: str = "",
+) -> list[int]:
+    """Ids of `repository`'s pull requests by `author` or with a title matching `title_pattern`.
+
+    Both are case-insensitive; an empty rule matches nothing.
+    """
+    conditions = []
+    if author.strip():
+        conditions.append(
+            func.lower(GithubPullRequest.author) == author.strip().lower()
+        )
+    if title_pattern.strip():
+        conditions.append(
+            func.lower(GithubPullRequest.title).like(
+                title_pattern_like(title_pattern.strip().lower()),
+                escape="\\",
+            ),
+        )
+    if not conditions:
+        return []
+
+    return list(
+        session.exec(
+            select(GithubPullRequest.id).where(
+                GithubPullRequest.repository == repository,
+                sa.not_(GithubPullRequest.excluded),
+                or_(*conditions),
+            ),
+        ).all(),
+    )
+
+
+def exclude_pull_requests(
+    session: Session,
+    ids: list[int],
+) -> int:
+    """Exclude the pull requests `ids` in one transaction; returns the number excluded.
+
+    They stay stored with their `excluded` flag set rather than being
+    deleted: a later sync upserts them again, and the flag, which the upsert
+    never overwrites, keeps them out of the table and of changelogs.
+    """
+    ids = sorted(set(ids))
+    excluded = 0
+    for offset in range(0, len(ids), EXCLUDE_BATCH_SIZE):
+        result = session.exec(
+            sa.update(GithubPullRequest)
+            .where(
+                col(GithubPullRequest.id).in_(
+                    ids[offset : offset + EXCLUDE_BATCH_SIZE]
+                ),
+                sa.not_(GithubPullRequest.excluded),
+            )
+            .values(excluded=True),
+        )
+        excluded += result.rowcount
+    session.commit()
+    return excluded
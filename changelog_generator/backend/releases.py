@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator
+
+from .github_client import PER_PAGE, GithubClient
+
+
+def parse_timestamp(
+    value: str,
+) -> datetime:
+    """Parse a GitHub API timestamp such as `2024-05-31T12:56:30Z`."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+@dataclass(frozen=True)
+class TagCommit:
+    """The commit a tag points at."""
+
+    sha: str
+    committed_at: datetime
+
+
+@dataclass(frozen=True)
+class ReleaseRange:
+    """The commits reachable from `end_tag` but not from `start_tag`."""
+
+    start_sha: str
+    end_sha: str
+    start_committed_at: datetime
+    end_committed_at: datetime
+    commit_shas: frozenset[str]
+
+    def contains(
+        self,
+        sha: str | None,
+    ) -> bool:
+        return sha is not None and sha in self.commit_shas
+
+
+async def _compare_commits(
+    client: GithubClient,
+    repository: str,
+    base: str,
+    head: str,
+) -> list[dict[str, Any]]:
+    path = f"/repos/{repository}/compare/{base}...{head}"
+    first = await client.get_json(path, {"per_page": PER_PAGE, "page": 1})
+    pages = math.ceil(first["total_commits"] / PER_PAGE)
+    rest = await asyncio.gather(
+        *[
+            client.get_json(path, {"per_page": PER_PAGE, "page": page})
+            for page in range(2, pages + 1)
+        ],
+    )
+    return [commit for page in [first, *rest] for commit in page["commits"]]
+
+
+async def resolve_tag(
+    client: GithubClient,
+    repository: str,
+    tag: str,
+) -> TagCommit:
+    commit = await client.get_json(f"/repos/{repository}/commits/{tag}")
+    return TagCommit(
+        sha=commit["sha"],
+        committed_at=parse_timestamp(commit["commit"]["committer"]["date"]),
+    )
+
+
+async def compare_release_range(
+    client: GithubClient,
+    repository: str,
+    start: TagCommit,
+    end: TagCommit,
+) -> ReleaseRange:
+    """Walk the commits between two resolved tags once."""
+    commits = await _compare_commits(client, repository, start.sha, end.sha)
+    return ReleaseRange(
+        start_sha=start.sha,
+        end_sha=end.sha,
+        start_committed_at=start.committed_at,
+        end_committed_at=end.committed_at,
+        commit_shas=frozenset(commit["sha"] for commit in commits),
+    )
+
+
+async def iter_merged_pull_requests(
+    client: GithubClient,
+    repository: str,
+    merged_since: datetime,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield every pull request merged at or after `merged_since`.
+
+    Pull requests are listed by most recently updated, so pagination stops at
+    the first one last touched before `merged_since`: anything merged after
+    that point has necessarily been updated after it too.
+    """
+    pages = client.iter_pages(
+        f"/repos/{repository}/pulls",
+        {"state": "closed", "sort": "updated", "direction": "desc"},
+    )
+    try:
+        async for page in pages:
+            for pr in page:
+                if parse_timestamp(pr["updated_at"]) < merged_since:
+                    return
+
+                merged_at = pr["merged_at"]
+                if merged_at and parse_timestamp(merged_at) >= merged_since:
+                    yield pr
+    finally:
+        await pages.aclose()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import re
+
+import sqlalchemy as sa
+from sqlmodel import or_
+
+from .models import GithubPullRequest
+
+FTS_TABLE = "githubpullrequest_fts"
+
+pull_request_fts = sa.table(
+    FTS_TABLE,
+    sa.column("rowid", sa.Integer),
+    sa.column("rank", sa.Float),
+)
+
+
+def fts_match_expression(
+    search_value: str,
+) -> str:
+    """Turn free text into an FTS5 query matching every word as a prefix.
+
+    `"fix parser"` becomes `"fix"* "parser"*`, so partially typed words match
+    and quotes in the input cannot change the query syntax.
+    """
+    words = re.findall(r"\w+", search_value.lower())
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def filter_pull_requests(
+    query: sa.Select,
+    search_value: str,
+    dialect: str,
+) -> tuple[sa.Select, sa.ColumnElement | None]:
+    """Restrict `query` to pull requests matching `search_value`.
+
+    On SQLite this joins the `githubpullrequest_fts` index and also returns
+    its bm25 `rank` column (lower is better) for ordering; other databases
+    fall back to a case-insensitive substring match on every column and no
+    rank.
+    """
+    match = fts_match_expression(search_value)
+    if dialect != "sqlite" or not match:
+        pattern = f"%{search_value.lower()}%"
+        query = query.where(
+            or_(
+                *[
+                    sa.cast(getattr(GithubPullRequest, field), sa.String).ilike(pattern)
+                    for field in GithubPullRequest.get_fields()
+                ],
+            ),
+        )
+        return query, None
+
+    query = query.join(
+        pull_request_fts,
+        pull_request_fts.c.rowid == GithubPullRequest.id,
+    ).where(sa.text(f"{FTS_TABLE} MATCH :match").bindparams(match=match))
+    return query, pull_request_fts.c.rank
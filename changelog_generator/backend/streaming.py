@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator
+
+FLUSH_INTERVAL = 0.05
+FLUSH_CHARS = 200
+
+_DONE = object()
+
+
+async def iter_completion_text(
+    stream: AsyncIterable[Any],
+) -> AsyncIterator[str]:
+    """Yield the text deltas of a streamed chat completion."""
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def coalesce(
+    chunks: AsyncIterable[str],
+    interval: float = FLUSH_INTERVAL,
+    max_chars: int = FLUSH_CHARS,
+) -> AsyncIterator[str]:
+    """Batch a stream of small text chunks into fewer, larger ones.
+
+    Buffered text is flushed once it reaches `max_chars` or once `interval`
+    seconds have passed since the last flush, whichever comes first, so a
+    stalled stream still shows what it has. The source is consumed by a
+    separate task, which lets the timer fire between chunks.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def consume() -> None:
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+        except Exception as error:
+            await queue.put(error)
+        finally:
+            await queue.put(_DONE)
+
+    consumer = asyncio.create_task(consume())
+    loop = asyncio.get_running_loop()
+    buffer: list[str] = []
+    size = 0
+    deadline = loop.time() + interval
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(
+                    queue.get(),
+                    timeout=max(deadline - loop.time(), 0),
+                )
+            except asyncio.TimeoutError:
+                item = None
+
+            if isinstance(item, Exception):
+                if buffer:
+                    yield "".join(buffer)
+                raise item
+
+            if isinstance(item, str):
+                buffer.append(item)
+                size += len(item)
+
+            done = item is _DONE
+            due = loop.time() >= deadline
+            if buffer and (done or due or size >= max_chars):
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+                due = True
+
+            if done:
+                return
+
+            if due:
+                deadline = loop.time() + interval
+    finally:
+        consumer.cancel()
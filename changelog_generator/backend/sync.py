@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlmodel import Session, select
+
+from .github_client import GithubClient
+from .models import GithubPullRequest, GithubReleaseRange, GithubSyncState, GithubTag
+from .pagination import PAGE_CACHE
+from .releases import (
+    ReleaseRange,
+    TagCommit,
+    compare_release_range,
+    iter_merged_pull_requests,
+    parse_timestamp,
+    resolve_tag,
+)
+
+# Rows sent per upsert; each batch is one executemany round trip.
+WRITE_BATCH_SIZE = 500
+
+# Columns a refetch overwrites; (repository, number) identifies the row.
+# `excluded` is not among them, so an excluded pull request stays excluded.
+UPSERT_COLUMNS = ("title", "body", "author", "merged_at", "url", "merge_commit_sha")
+
+
+def _to_row(
+    repository: str,
+    pr: dict[str, Any],
+) -> dict[str, Any]:
+    return {
+        "title": pr["title"],
+        "number": pr["number"],
+        "body": pr["body"] or "",
+        "author": pr["user"]["login"],
+        "merged_at": parse_timestamp(pr["merged_at"]).isoformat(),
+        "url": pr["html_url"],
+        "repository": repository,
+        "merge_commit_sha": pr["merge_commit_sha"],
+    }
+
+
+def _upsert_statement(dialect: str) -> sa.Insert:
+    """`INSERT ... ON CONFLICT (repository, number) DO UPDATE` for `dialect`."""
+    table = GithubPullRequest.__table__
+    if dialect == "mysql":
+        statement = mysql.insert(table)
+        return statement.on_duplicate_key_update(
+            {column: statement.inserted[column] for column in UPSERT_COLUMNS},
+        )
+
+    inserts = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+    if dialect not in inserts:
+        raise ValueError(
+            f"Unsupported database dialect {dialect!r}: pull requests can only "
+            "be synced to SQLite, PostgreSQL or MySQL",
+        )
+    statement = inserts[dialect](table)
+    return statement.on_conflict_do_update(
+        index_elements=["repository", "number"],
+        set_={column: statement.excluded[column] for column in UPSERT_COLUMNS},
+    )
+
+
+def _stored_release_range(
+    session: Session,
+    repository: str,
+    start_tag: str,
+    end_tag: str,
+) -> ReleaseRange | None:
+    stored = session.exec(
+        select(GithubReleaseRange).where(
+            GithubReleaseRange.repository == repository,
+            GithubReleaseRange.start_tag == start_tag,
+            GithubReleaseRange.end_tag == end_tag,
+        ),
+    ).first()
+    if stored is None:
+        return None
+    return ReleaseRange(
+        start_sha=stored.start_sha,
+        end_sha=stored.end_sha,
+        start_committed_at=datetime.fromisoformat(stored.start_committed_at),
+        end_committed_at=datetime.fromisoformat(stored.end_committed_at),
+        commit_shas=frozenset(stored.commit_shas.split()),
+    )
+
+
+def _sync_state(
+    session: Session,
+    repository: str,
+) -> GithubSyncState | None:
+    return session.exec(
+        select(GithubSyncState).where(
+            GithubSyncState.repository == repository,
+        ),
+    ).first()
+
+
+def _covers(
+    state: GithubSyncState | None,
+    release_range: ReleaseRange,
+) -> bool:
+    return (
+        state is not None
+        and state.synced_from <= release_range.start_committed_at.isoformat()
+        and state.synced_until >= release_range.end_committed_at.isoformat()
+    )
+
+
+def _stored_pull_requests(
+    session: Session,
+    repository: str,
+    release_range: ReleaseRange,
+) -> list[GithubPullRequest]:
+    """One indexed `merged_at BETWEEN` query, narrowed to the range's commits.
+
+    Excluded pull requests are left out.
+    """
+    candidates = session.exec(
+        select(GithubPullRequest)
+        .where(
+            GithubPullRequest.repository == repository,
+            sa.not_(GithubPullRequest.excluded),
+            GithubPullRequest.merged_at.between(
+                release_range.start_committed_at.isoformat(),
+                release_range.end_committed_at.isoformat(),
+            ),
+        )
+        .order_by(GithubPullRequest.merged_at),
+    ).all()
+    return [
+        pull_request
+        for pull_request in candidates
+        if release_range.contains(pull_request.merge_commit_sha)
+    ]
+
+
+def stored_pull_requests_between_tags(
+    session: Session,
+    repository: str,
+    start_tag: str,
+    end_tag: str,
+) -> list[GithubPullRequest] | None:
+    """The pull requests between two tags from local data alone.
+
+    Returns None when the range has not been resolved before or the stored
+    history does not cover it yet; `PullRequestSync` then fills the gap.
+    """
+    release_range = _stored_release_range(session, repository, start_tag, end_tag)
+    if release_range is None or not _covers(
+        _sync_state(session, repository),
+        release_range,
+    ):
+        return None
+    return _stored_pull_requests(session, repository, release_range)
+
+
+class PullRequestSync:
+    """Keeps the stored pull requests of one repository in step with GitHub.
+
+    Tags, tag ranges and pull requests are written to the database as they
+    are fetched, so a range that has been synced before is answered entirely
+    from local data, a tag is resolved only once for every range it bounds,
+    and a new range only fetches pull requests merged after the stored
+    high-water mark.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        client: GithubClient,
+        repository: str,
+    ) -> None:
+        self.session = session
+        self.client = client
+        self.repository = repository
+
+    async def pull_requests_between_tags(
+        self,
+        start_tag: str,
+        end_tag: str,
+    ) -> list[GithubPullRequest]:
+        release_range = await self._release_range(start_tag, end_tag)
+        state = _sync_state(self.session, self.repository)
+        if not _covers(state, release_range):
+            await self._sync(state, release_range.start_committed_at)
+
+        return _stored_pull_requests(self.session, self.repository, release_range)
+
+    async def _release_range(
+        self,
+        start_tag: str,
+        end_tag: str,
+    ) -> ReleaseRange:
+        stored = _stored_release_range(
+            self.session,
+            self.repository,
+            start_tag,
+            end_tag,
+        )
+        if stored is not None:
+            return stored
+
+        if start_tag == end_tag:
+            start = end = await self._tag(start_tag)
+        else:
+            start, end = await asyncio.gather(self._tag(start_tag), self._tag(end_tag))
+        release_range = await compare_release_range(
+            self.client,
+            self.repository,
+            start,
+            end,
+        )
+        self.session.add(
+            GithubReleaseRange(
+                repository=self.repository,
+                start_tag=start_tag,
+                end_tag=end_tag,
+                start_sha=release_range.start_sha,
+                end_sha=release_range.end_sha,
+                start_committed_at=release_range.start_committed_at.isoformat(),
+                end_committed_at=release_range.end_committed_at.isoformat(),
+                commit_shas=" ".join(sorted(release_range.commit_shas)),
+            ),
+        )
+        self.session.commit()
+        return release_range
+
+    async def _tag(
+        self,
+        name: str,
+    ) -> TagCommit:
+        """The stored commit of tag `name`, resolved through the API only once."""
+        stored = self.session.exec(
+            select(GithubTag).where(
+                GithubTag.repository == self.repository,
+                GithubTag.name == name,
+            ),
+        ).first()
+        if stored is not None:
+            return TagCommit(
+                sha=stored.sha,
+                committed_at=datetime.fromisoformat(stored.committed_at),
+            )
+
+        tag = await resolve_tag(self.client, self.repository, name)
+        self.session.add(
+            GithubTag(
+                repository=self.repository,
+                name=name,
+                sha=tag.sha,
+                committed_at=tag.committed_at.isoformat(),
+            ),
+        )
+        return tag
+
+    async def _sync(
+        self,
+        state: GithubSyncState | None,
+        merged_since: datetime,
+    ) -> None:
+        """Fetch what the stored history is missing back to `merged_since`."""
+        synced_until = datetime.now(timezone.utc).isoformat()
+        merged_since_iso = merged_since.isoformat()
+        if state is None:
+            state = GithubSyncState(
+                repository=self.repository,
+                synced_from=merged_since_iso,
+                synced_until=synced_until,
+            )
+        elif state.synced_from <= merged_since_iso:
+            # Only the newer end is missing: resume from the high-water mark.
+            merged_since = datetime.fromisoformat(
+                state.last_merged_at or state.synced_from,
+            )
+        else:
+            state.synced_from = merged_since_iso
+
+        fetched = [
+            _to_row(self.repository, pr)
+            async for pr in iter_merged_pull_requests(
+                self.client,
+                self.repository,
+                merged_since,
+            )
+        ]
+        self._write(fetched)
+
+        state.synced_until = synced_until
+        for row in fetched:
+            state.last_merged_at = max(state.last_merged_at, row["merged_at"])
+
+        self.session.add(state)
+        self.session.commit()
+        if fetched:
+            # Only once committed, so no reader caches the old rows again.
+            PAGE_CACHE.invalidate()
+
+    def _write(
+        self,
+        rows: list[dict[str, Any]],
+    ) -> None:
+        """Insert or refresh `rows` with one batched upsert per `WRITE_BATCH_SIZE`."""
+        if not rows:
+            return
+        # One row per number, since a batch may not update the same row twice
+        rows = list({row["number"]: row for row in rows}.values())
+
+        statement = _upsert_statement(self.session.get_bind().dialect.name)
+        for offset in range(0, len(rows), WRITE_BATCH_SIZE):
+            self.session.execute(statement, rows[offset : offset + WRITE_BATCH_SIZE])
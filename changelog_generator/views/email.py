@@ -12,7 +12,7 @@ def email_box():
                 color_scheme="gray",
                 size="2",
                 on_click=[
-                    rx.set_clipboard(State.email_content_data),
+                    rx.set_clipboard(State.changelog_content_data),
                     rx.toast.info("Copied to clipboard"),
                 ],
                 cursor="pointer",
@@ -22,7 +22,7 @@ def email_box():
                 z_index="10",
             ),
             rx.text(
-                State.email_content_data,
+                State.changelog_content_data,
                 line_height="1.75",
             ),
             type="auto",
@@ -79,9 +79,22 @@ def email_gen_ui():
     return (
         rx.card(
             rx.flex(
-                rx.button(
-                    "Generate Changelog",
-                    on_click=State.generate_email,
+                rx.hstack(
+                    rx.button(
+                        "Generate Changelog",
+                        on_click=State.generate_changelog,
+                        loading=State.gen_response,
+                        flex="1",
+                    ),
+                    rx.tooltip(
+                        rx.icon_button(
+                            rx.icon("refresh-cw"),
+                            on_click=State.regenerate_changelog,
+                            disabled=State.gen_response,
+                            variant="soft",
+                        ),
+                        content="Regenerate, ignoring the cached changelog",
+                    ),
                     width="100%",
                 ),
                 email_box(),
@@ -1,6 +1,7 @@
 import reflex as rx
 
 from changelog_generator.backend.backend import GithubPullRequest, State
+from changelog_generator.backend.pagination import SORTABLE_COLUMNS
 
 
 def _header_cell(
@@ -18,8 +19,16 @@ def _header_cell(
 def _show_pull_request(
     pull_request: GithubPullRequest,
 ):
-    """Show a customer in a table row."""
+    """Show a pull request in a table row."""
     return rx.table.row(
+        rx.table.cell(
+            rx.checkbox(
+                checked=State.selected_ids.contains(pull_request.id),
+                on_change=lambda checked: State.toggle_selected(
+                    pull_request.id, checked
+                ),
+            ),
+        ),
         rx.table.row_header_cell(pull_request.number),
         rx.table.cell(pull_request.author),
         rx.table.cell(pull_request.title),
@@ -27,8 +36,8 @@ def _show_pull_request(
         rx.table.cell(pull_request.url),
         rx.table.cell(
             rx.icon_button(
-                rx.icon("trash-2", size=22),
-                on_click=lambda: State.delete_pull_request(pull_request.id),
+                rx.icon("eye-off", size=22),
+                on_click=lambda: State.exclude_pull_request(pull_request.id),
                 size="2",
                 variant="solid",
                 color_scheme="red",
@@ -40,6 +49,95 @@ def _show_pull_request(
     )
 
 
+def _pagination():
+    return rx.hstack(
+        rx.cond(
+            State.release_size > 0,
+            rx.hstack(
+                rx.switch(
+                    checked=State.show_release,
+                    on_change=lambda checked: State.set_show_release(checked),
+                ),
+                rx.text(
+                    "Only the fetched release (",
+                    State.release_size,
+                    " pull requests)",
+                ),
+                align="center",
+                spacing="2",
+            ),
+        ),
+        rx.spacer(),
+        rx.button(
+            rx.icon("chevron-left", size=18),
+            "Previous",
+            on_click=State.previous_page,
+            disabled=~State.has_previous_page,
+            variant="surface",
+        ),
+        rx.button(
+            "Next",
+            rx.icon("chevron-right", size=18),
+            on_click=State.next_page,
+            disabled=~State.has_next_page,
+            variant="surface",
+        ),
+        justify="end",
+        spacing="3",
+        width="100%",
+        padding_top="1em",
+    )
+
+
+def _bulk_actions():
+    return rx.flex(
+        rx.button(
+            rx.icon("eye-off", size=18),
+            "Exclude selected (",
+            State.selected_ids.length(),
+            ")",
+            on_click=State.exclude_selected,
+            disabled=State.selected_ids.length() == 0,
+            color_scheme="red",
+            variant="surface",
+        ),
+        rx.button(
+            "Clear selection",
+            on_click=State.clear_selection,
+            disabled=State.selected_ids.length() == 0,
+            variant="surface",
+        ),
+        rx.spacer(),
+        rx.input(
+            placeholder="Exclude author, e.g. dependabot[bot]",
+            size="3",
+            max_width="260px",
+            width="100%",
+            variant="surface",
+            on_change=lambda value: State.set_exclude_author(value),
+        ),
+        rx.input(
+            placeholder="Exclude titles, e.g. Bump *",
+            size="3",
+            max_width="225px",
+            width="100%",
+            variant="surface",
+            on_change=lambda value: State.set_exclude_title_pattern(value),
+        ),
+        rx.button(
+            "Exclude matching",
+            on_click=State.exclude_matching,
+            color_scheme="red",
+            variant="surface",
+        ),
+        align="center",
+        spacing="3",
+        wrap="wrap",
+        width="100%",
+        padding_bottom="1em",
+    )
+
+
 def main_table():
     return rx.fragment(
         rx.flex(
@@ -79,9 +177,49 @@ def main_table():
             width="100%",
             padding_bottom="1em",
         ),
+        rx.flex(
+            rx.input(
+                rx.input.slot(rx.icon("search")),
+                placeholder="Search pull requests...",
+                size="3",
+                max_width="225px",
+                width="100%",
+                variant="surface",
+                on_change=lambda value: State.filter_values(value),
+            ),
+            rx.spacer(),
+            rx.select(
+                list(SORTABLE_COLUMNS),
+                placeholder="Sort by",
+                size="3",
+                on_change=lambda value: State.sort_values(value),
+            ),
+            rx.icon_button(
+                rx.cond(
+                    State.sort_reverse,
+                    rx.icon("arrow-down-z-a", size=22),
+                    rx.icon("arrow-down-a-z", size=22),
+                ),
+                on_click=State.toggle_sort,
+                size="3",
+                variant="surface",
+            ),
+            align="center",
+            spacing="3",
+            wrap="wrap",
+            width="100%",
+            padding_bottom="1em",
+        ),
+        _bulk_actions(),
         rx.table.root(
             rx.table.header(
                 rx.table.row(
+                    rx.table.column_header_cell(
+                        rx.checkbox(
+                            checked=State.page_selected,
+                            on_change=lambda checked: State.select_page(checked),
+                        ),
+                    ),
                     _header_cell("PR #"),
                     _header_cell("Author"),
                     _header_cell("Title"),
@@ -97,4 +235,5 @@ def main_table():
             size="3",
             width="100%",
         ),
+        _pagination(),
     )
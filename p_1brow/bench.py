@@ -0,0 +1,190 @@
+"""Benchmark runner for the processing engines.
+
+Each engine runs as its own `process_rows.py` subprocess, so wall time, peak
+RSS and CPU time are measured per run and include any worker processes.
+Results are written as JSON and can be compared against a stored baseline.
+
+Engines that keep files between runs get fresh ones in a temporary directory
+for every run, which is removed afterwards, so each run is measured cold.
+Pass e.g. `-- --cache file.duckdb` to measure warm runs instead.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from process_rows import ENGINES
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+PROCESS_ROWS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "process_rows.py"
+)
+
+# Per-run files, by engine: the option and the file name to pass.
+RUN_FILES = {
+    "columnar": ("--cache", "cache.duckdb"),
+    # Without a fresh state, every run after the first reads 0 appended bytes
+    "incremental": ("--state", "state.json"),
+}
+
+
+def count_rows(file_name):
+    rows = 0
+    with open(file_name, "rb") as f:
+        while block := f.read(64 * 1024 * 1024):
+            rows += block.count(b"\n")
+    return rows
+
+
+def run_once(file_name, engine, extra_args):
+    """Run one engine to completion and return its resource usage."""
+    # Next to the input rather than in /tmp, which may be too small for a cache
+    with tempfile.TemporaryDirectory(
+        dir=os.path.dirname(os.path.abspath(file_name))
+    ) as run_dir:
+        run_args = []
+        if engine in RUN_FILES:
+            option, name = RUN_FILES[engine]
+            run_args = [option, os.path.join(run_dir, name)]
+
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                PROCESS_ROWS,
+                file_name,
+                "--engine",
+                engine,
+                *run_args,
+                *extra_args,
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        # wait4 reports this child's own usage, including the workers it reaped
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"{engine} exited with status {process.returncode}")
+
+    cpu = usage.ru_utime + usage.ru_stime
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss_bytes = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return {"wall_seconds": wall, "cpu_seconds": cpu, "peak_rss_mb": rss_bytes / 2**20}
+
+
+def benchmark(file_name, engines, repeat, extra_args):
+    rows = count_rows(file_name)
+    results = {}
+    for engine in engines:
+        runs = []
+        for i in range(repeat):
+            run = run_once(file_name, engine, extra_args)
+            logging.info(
+                f"{engine} run {i + 1}/{repeat}: {run['wall_seconds']:.2f} seconds"
+            )
+            runs.append(run)
+
+        wall = statistics.median(run["wall_seconds"] for run in runs)
+        results[engine] = {
+            "runs": runs,
+            "median_wall_seconds": wall,
+            "best_wall_seconds": min(run["wall_seconds"] for run in runs),
+            "rows_per_second": rows / wall,
+            "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+            "cpu_utilization": statistics.median(
+                run["cpu_seconds"] / run["wall_seconds"] for run in runs
+            ),
+        }
+
+    return {
+        "file": os.path.abspath(file_name),
+        "rows": rows,
+        "repeat": repeat,
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Log each engine against the baseline and return the regressed ones."""
+    regressions = []
+    for engine, result in report["results"].items():
+        previous = baseline.get("results", {}).get(engine)
+        if previous is None:
+            continue
+        ratio = result["median_wall_seconds"] / previous["median_wall_seconds"]
+        logging.info(f"{engine}: {ratio:.2f}x baseline median wall time")
+        if ratio > 1 + tolerance:
+            regressions.append(engine)
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the processing engines on a measurements file."
+    )
+    parser.add_argument(
+        "file_name", help="measurements file, e.g. one written by generate.py"
+    )
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="runs per engine (default: 3)"
+    )
+    parser.add_argument(
+        "--output", default=None, help="write the JSON report here (default: stdout)"
+    )
+    parser.add_argument(
+        "--baseline", default=None, help="compare against this earlier JSON report"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="allowed slowdown against the baseline before failing (default: 0.10)",
+    )
+    parser.epilog = "Arguments after `--` are passed on to process_rows.py."
+
+    # Split off the engine arguments by hand; argparse would try to parse them
+    argv = sys.argv[1:] if argv is None else list(argv)
+    engine_args = []
+    if "--" in argv:
+        engine_args = argv[argv.index("--") + 1 :]
+        argv = argv[: argv.index("--")]
+    args = parser.parse_args(argv)
+    args.engine_args = engine_args
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = benchmark(args.file_name, args.engines, args.repeat, args.engine_args)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            logging.error(f"Slower than baseline: {', '.join(regressions)}")
+            sys.exit(1)
@@ -0,0 +1,84 @@
+"""Multi-process aggregation over newline-aligned byte ranges of the input.
+
+Each worker streams its own range of the file in fixed-size blocks and keeps
+only per-station [min, max, sum, count] aggregates, so memory is bounded by
+the number of stations rather than the size of the file.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from stats import MAX, MIN, SUM, COUNT, merge_stats
+
+BLOCK_SIZE = 16 * 1024 * 1024
+# More ranges than workers, so a slow range does not leave the others idle.
+RANGES_PER_WORKER = 4
+
+
+def split_ranges(file_name, parts, start=0, end=None):
+    """Split bytes [start, end) of the file into `parts` ranges that start and end on
+    line breaks; `start` must itself be at the beginning of a line."""
+    size = os.path.getsize(file_name) if end is None else end
+    boundaries = [start]
+    with open(file_name, "rb") as f:
+        for i in range(1, parts):
+            offset = max(start + (size - start) * i // parts, boundaries[-1])
+            f.seek(offset)
+            f.readline()
+            boundaries.append(min(f.tell(), size))
+    boundaries.append(size)
+    return [
+        (start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start
+    ]
+
+
+def aggregate_lines(stats, lines):
+    """Fold `station;temp` lines (bytes) into `stats`."""
+    for line in lines:
+        if not line:
+            continue
+        station, _, temperature = line.rpartition(b";")
+        tenths = int(temperature.replace(b".", b""))
+        current = stats.get(station)
+        if current is None:
+            stats[station] = [tenths, tenths, tenths, 1]
+            continue
+        if tenths < current[MIN]:
+            current[MIN] = tenths
+        elif tenths > current[MAX]:
+            current[MAX] = tenths
+        current[SUM] += tenths
+        current[COUNT] += 1
+
+
+def aggregate_range(file_name, start, end):
+    """Aggregate the lines in bytes [start, end), which must be line-aligned."""
+    stats = {}
+    remainder = b""
+    with open(file_name, "rb") as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            block = f.read(min(BLOCK_SIZE, end - position))
+            if not block:
+                break
+            position += len(block)
+            block = remainder + block
+            cut = block.rfind(b"\n") + 1
+            remainder = block[cut:]
+            aggregate_lines(stats, block[:cut].split(b"\n"))
+    # The last line of the file may have no trailing newline.
+    aggregate_lines(stats, [remainder.rstrip(b"\r")])
+    return stats
+
+
+def process_chunked(file_name, workers, start=0, end=None):
+    ranges = split_ranges(file_name, workers * RANGES_PER_WORKER, start, end)
+    stats = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(aggregate_range, file_name, start, end) for start, end in ranges
+        ]
+        for future in futures:
+            merge_stats(stats, future.result())
+    return stats
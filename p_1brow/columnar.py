@@ -0,0 +1,183 @@
+"""Columnar cache of a measurements file in DuckDB's native format.
+
+The CSV is parsed once into a file-backed DuckDB database next to it, with
+`station` stored as an ENUM (dictionary-encoded) and `temperature` as integer
+tenths. Rows are sorted by station, so per-station queries skip most of the
+table using DuckDB's row-group min/max statistics.
+
+The cache records a fingerprint of the source file's path, size and
+modification time and is rebuilt only when that fingerprint changes, so
+repeated aggregations and ad hoc queries skip the CSV parse entirely.
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import time
+
+from output import iter_cursor
+from process_rows import connect, read_measurements
+from profiling import span
+
+CACHE_SUFFIX = ".duckdb"
+
+# The cached temperatures are already integer tenths
+AGGREGATES = """
+    MIN(temperature)::BIGINT AS min,
+    MAX(temperature)::BIGINT AS max,
+    SUM(temperature)::BIGINT AS sum,
+    COUNT(*) AS count
+"""
+
+
+def fingerprint(file_name):
+    """A hash of the source file's identity; changes whenever the file does."""
+    info = os.stat(file_name)
+    key = f"{os.path.abspath(file_name)}:{info.st_size}:{info.st_mtime_ns}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def cache_path_for(file_name):
+    return file_name + CACHE_SUFFIX
+
+
+def _cached_fingerprint(cache_path):
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        con = connect(database=cache_path, read_only=True)
+    except Exception:
+        # Unreadable or from an incompatible DuckDB version; rebuild it
+        return None
+    try:
+        return con.execute("SELECT fingerprint FROM source").fetchone()[0]
+    except Exception:
+        return None
+    finally:
+        con.close()
+
+
+def build_cache(file_name, cache_path, threads=None, memory_limit=None):
+    """Parse the CSV once into a new cache database at `cache_path`."""
+    start = time.time()
+    partial = cache_path + ".tmp"
+    if os.path.exists(partial):
+        os.remove(partial)
+
+    con = connect(threads, memory_limit, database=partial)
+    try:
+        con.execute(
+            f"""CREATE TEMP TABLE staged AS
+                        SELECT station, CAST(ROUND(temperature * 10) AS SMALLINT) AS temperature
+                        FROM {read_measurements(file_name)}"""
+        )
+        con.execute(
+            "CREATE TYPE station_name AS ENUM (SELECT DISTINCT station FROM staged ORDER BY station)"
+        )
+        con.execute(
+            """CREATE TABLE measurements AS
+                       SELECT station::station_name AS station, temperature FROM staged
+                       ORDER BY station"""
+        )
+        con.execute("DROP TABLE staged")
+        con.execute("CREATE TABLE source (file_name VARCHAR, fingerprint VARCHAR)")
+        con.execute(
+            "INSERT INTO source VALUES (?, ?)",
+            [os.path.abspath(file_name), fingerprint(file_name)],
+        )
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+
+    # Only a complete cache ever appears under the final name
+    os.replace(partial, cache_path)
+    logging.info(
+        f"Built columnar cache {cache_path} in {time.time() - start:.2f} seconds"
+    )
+
+
+def open_cache(file_name, cache_path=None, threads=None, memory_limit=None):
+    """A read-only connection to an up-to-date cache of `file_name`, building it if needed."""
+    cache_path = cache_path or cache_path_for(file_name)
+    if _cached_fingerprint(cache_path) == fingerprint(file_name):
+        logging.info(f"Reusing columnar cache {cache_path}")
+    else:
+        with span("read+parse"):
+            build_cache(file_name, cache_path, threads, memory_limit)
+    return connect(threads, memory_limit, database=cache_path, read_only=True)
+
+
+def process_columnar(file_name, cache_path=None, threads=None, memory_limit=None):
+    """Station-sorted batches of aggregates, streamed from the cache."""
+    con = open_cache(file_name, cache_path, threads, memory_limit)
+    # The ENUM was created in sorted order, so ordering by it sorts by name
+    return iter_cursor(
+        con,
+        f"""SELECT station::VARCHAR, {AGGREGATES}
+                                FROM measurements
+                                GROUP BY station
+                                ORDER BY station""",
+    )
+
+
+def station_stats(con, stations):
+    """Aggregates for just the named stations, as ad hoc queries against the cache."""
+    rows = con.execute(
+        f"""SELECT station::VARCHAR, {AGGREGATES}
+                           FROM measurements
+                           WHERE station IN (
+                               -- Names outside the dictionary cannot be cast, and match nothing anyway
+                               SELECT name::station_name FROM (SELECT UNNEST(?) AS name)
+                               WHERE name IN (SELECT UNNEST(enum_range(NULL::station_name))))
+                           GROUP BY station""",
+        [list(stations)],
+    ).fetchall()
+    return {
+        station: [low, high, total, count] for station, low, high, total, count in rows
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build or query the columnar cache of a measurements file."
+    )
+    parser.add_argument(
+        "file_name",
+        help="measurements file with one `station;temperature` row per line",
+    )
+    parser.add_argument(
+        "--cache",
+        default=None,
+        help=f"cache database (default: <file_name>{CACHE_SUFFIX})",
+    )
+    parser.add_argument(
+        "--station",
+        action="append",
+        default=[],
+        help="print min/mean/max for this station; may be repeated",
+    )
+    parser.add_argument(
+        "--threads", type=int, default=None, help="DuckDB worker threads"
+    )
+    parser.add_argument(
+        "--memory-limit", default=None, help="DuckDB memory limit, e.g. 4GB"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    from output import format_station, iter_stats
+
+    args = parse_args()
+    con = open_cache(args.file_name, args.cache, args.threads, args.memory_limit)
+    if args.station:
+        start = time.time()
+        stats = station_stats(con, args.station)
+        logging.info(
+            f"Queried {len(args.station)} stations in {time.time() - start:.3f} seconds"
+        )
+        for batch in iter_stats(stats):
+            for row in batch:
+                print(format_station(*row))
+    con.close()
@@ -0,0 +1,173 @@
+"""Deterministic generator of `station;temperature` measurement files.
+
+The same seed, row count and station count always produce the same file, so
+benchmark runs on different machines read identical input.
+"""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# A sample of real stations and their mean temperatures; larger cardinalities
+# are filled with numbered variants of these names.
+STATIONS = [
+    ("Abha", 18.0),
+    ("Abidjan", 26.0),
+    ("Accra", 26.4),
+    ("Addis Ababa", 16.0),
+    ("Adelaide", 17.3),
+    ("Alexandria", 20.0),
+    ("Amsterdam", 10.2),
+    ("Anchorage", 2.8),
+    ("Athens", 19.2),
+    ("Auckland", 15.2),
+    ("Baghdad", 22.77),
+    ("Bangkok", 28.6),
+    ("Barcelona", 18.2),
+    ("Beijing", 12.9),
+    ("Berlin", 10.3),
+    ("Bogotá", 15.6),
+    ("Boston", 10.9),
+    ("Budapest", 11.3),
+    ("Bulawayo", 18.9),
+    ("Cairo", 21.4),
+    ("Cape Town", 16.2),
+    ("Chicago", 9.8),
+    ("Copenhagen", 9.1),
+    ("Cracow", 9.3),
+    ("Dakar", 24.0),
+    ("Delhi", 25.0),
+    ("Dubai", 26.9),
+    ("Dublin", 9.8),
+    ("Edinburgh", 9.3),
+    ("Hamburg", 9.7),
+    ("Hanoi", 23.6),
+    ("Helsinki", 5.9),
+    ("Hong Kong", 23.3),
+    ("Honolulu", 25.4),
+    ("İzmir", 17.9),
+    ("Istanbul", 13.9),
+    ("Jakarta", 26.7),
+    ("Kampala", 20.0),
+    ("Kathmandu", 18.3),
+    ("Kyiv", 8.4),
+    ("Lagos", 26.8),
+    ("Lima", 19.6),
+    ("Lisbon", 17.5),
+    ("London", 11.3),
+    ("Los Angeles", 18.6),
+    ("Madrid", 15.0),
+    ("Manila", 28.4),
+    ("Melbourne", 15.1),
+    ("Mexico City", 17.5),
+    ("Montreal", 6.8),
+    ("Moscow", 5.8),
+    ("Mumbai", 27.1),
+    ("Nairobi", 17.8),
+    ("New York City", 12.9),
+    ("Oslo", 5.7),
+    ("Palembang", 27.3),
+    ("Paris", 12.3),
+    ("Prague", 8.4),
+    ("Reykjavík", 4.3),
+    ("Rome", 15.2),
+    ("São Paulo", 19.7),
+    ("Seoul", 12.5),
+    ("Singapore", 27.0),
+    ("St. John's", 5.0),
+    ("Stockholm", 6.6),
+    ("Sydney", 17.7),
+    ("Taipei", 23.0),
+    ("Tokyo", 15.4),
+    ("Toronto", 9.4),
+    ("Vancouver", 10.4),
+    ("Vienna", 10.4),
+    ("Warsaw", 8.5),
+    ("Wellington", 12.9),
+    ("Yakutsk", -8.8),
+    ("Zürich", 9.3),
+]
+STANDARD_DEVIATION = 10.0
+BATCH_ROWS = 1_000_000
+SUFFIXES = {"K": 10**3, "M": 10**6, "B": 10**9}
+
+
+def parse_count(text):
+    """Parse counts such as `1000`, `1M`, `100M` or `1B`."""
+    text = text.strip().upper()
+    if text[-1:] in SUFFIXES:
+        return int(float(text[:-1]) * SUFFIXES[text[-1]])
+    return int(text)
+
+
+def station_table(count, rng):
+    """`count` distinct station names (as bytes) and their mean temperatures."""
+    names = []
+    means = []
+    for i in range(count):
+        name, mean = STATIONS[i % len(STATIONS)]
+        if i >= len(STATIONS):
+            name = f"{name} {i // len(STATIONS)}"
+            mean = mean + rng.uniform(-5, 5)
+        names.append(name.encode("utf-8"))
+        means.append(mean)
+    return names, np.array(means)
+
+
+def generate(file_name, rows, stations, seed=0):
+    rng = np.random.default_rng(seed)
+    names, means = station_table(stations, rng)
+    # Every temperature in tenths maps to its text, so rows are formatted by lookup
+    temperatures = [f"{tenths / 10:.1f}".encode() for tenths in range(-999, 1000)]
+
+    with open(file_name, "wb", buffering=16 * 1024 * 1024) as f:
+        written = 0
+        while written < rows:
+            batch = min(BATCH_ROWS, rows - written)
+            codes = rng.integers(0, stations, size=batch)
+            tenths = np.rint(rng.normal(means[codes], STANDARD_DEVIATION) * 10)
+            indexes = (np.clip(tenths, -999, 999) + 999).astype(np.int64)
+            f.write(
+                b"".join(
+                    names[code] + b";" + temperatures[index] + b"\n"
+                    for code, index in zip(codes.tolist(), indexes.tolist())
+                )
+            )
+            written += batch
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate a deterministic measurements file."
+    )
+    parser.add_argument("file_name", help="output file")
+    parser.add_argument(
+        "--rows",
+        type=parse_count,
+        default=parse_count("1M"),
+        help="number of rows, e.g. 1M, 100M or 1B (default: 1M)",
+    )
+    parser.add_argument(
+        "--stations",
+        type=parse_count,
+        default=len(STATIONS),
+        help=f"number of distinct stations (default: {len(STATIONS)})",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.time()
+    generate(args.file_name, args.rows, args.stations, args.seed)
+    logging.info(
+        f"Wrote {args.rows} rows for {args.stations} stations to {args.file_name} "
+        f"in {time.time() - start:.2f} seconds"
+    )
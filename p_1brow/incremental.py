@@ -0,0 +1,143 @@
+"""Incremental aggregation of a measurements file that only ever grows.
+
+Per-station [min, max, sum, count] aggregates are persisted together with the
+byte offset just past the last line they include. A refresh reads only the
+lines appended since then, merges them into the stored aggregates and saves
+the new state, so its cost depends on the new data rather than the file size.
+A trailing line without its newline is left for the next refresh, since the
+writer may still be in the middle of it.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+
+from chunked import aggregate_range, process_chunked
+from output import iter_stats, open_output, write_result
+from profiling import span
+from stats import COUNT, merge_stats
+
+STATE_SUFFIX = ".state.json"
+# Checksummed prefix that detects a file rewritten in place rather than appended to
+HEAD_BYTES = 4096
+# Tails smaller than this are aggregated in-process instead of in worker processes
+PARALLEL_THRESHOLD = 64 * 1024 * 1024
+
+
+def state_path_for(file_name):
+    return file_name + STATE_SUFFIX
+
+
+def head_digest(file_name, length):
+    with open(file_name, "rb") as f:
+        return hashlib.sha256(f.read(min(length, HEAD_BYTES))).hexdigest()
+
+
+def load_state(file_name, state_path):
+    """The stored state, or an empty one when it does not describe this file's prefix."""
+    empty = {"offset": 0, "head": head_digest(file_name, 0), "stats": {}}
+    if not os.path.exists(state_path):
+        return empty
+    with open(state_path) as f:
+        state = json.load(f)
+
+    if state["offset"] > os.path.getsize(file_name):
+        logging.info(
+            f"{file_name} is shorter than the stored offset; aggregating from the start"
+        )
+        return empty
+    if head_digest(file_name, state["offset"]) != state["head"]:
+        logging.info(
+            f"{file_name} was rewritten since the last refresh; aggregating from the start"
+        )
+        return empty
+    return state
+
+
+def save_state(state_path, state):
+    partial = state_path + ".tmp"
+    with open(partial, "w") as f:
+        json.dump(state, f)
+    os.replace(partial, state_path)
+
+
+def complete_end(file_name, start, size):
+    """The offset just past the last newline in bytes [start, size), or `start` if there is none."""
+    with open(file_name, "rb") as f:
+        position = size
+        while position > start:
+            block_start = max(start, position - 64 * 1024)
+            f.seek(block_start)
+            cut = f.read(position - block_start).rfind(b"\n")
+            if cut >= 0:
+                return block_start + cut + 1
+            position = block_start
+    return start
+
+
+def process_incremental(file_name, state_path=None, workers=None):
+    state_path = state_path or state_path_for(file_name)
+    state = load_state(file_name, state_path)
+    start = state["offset"]
+    end = complete_end(file_name, start, os.path.getsize(file_name))
+
+    if end > start:
+        logging.info(
+            f"Aggregating {end - start} appended bytes of {file_name} from offset {start}"
+        )
+        with span("read+parse+aggregate", bytes=end - start) as tail_span:
+            if end - start >= PARALLEL_THRESHOLD:
+                tail = process_chunked(file_name, workers or os.cpu_count(), start, end)
+            else:
+                tail = aggregate_range(file_name, start, end)
+            tail_span.rows = sum(aggregates[COUNT] for aggregates in tail.values())
+        # JSON keys are strings, so the stored stations are decoded names
+        merge_stats(
+            state["stats"],
+            {
+                station.decode("utf-8"): aggregates
+                for station, aggregates in tail.items()
+            },
+        )
+        state["offset"] = end
+        state["head"] = head_digest(file_name, end)
+        save_state(state_path, state)
+    else:
+        logging.info(f"No new lines in {file_name} since offset {start}")
+
+    return state["stats"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Refresh the stored aggregates with lines appended since the last run."
+    )
+    parser.add_argument(
+        "file_name",
+        help="measurements file with one `station;temperature` row per line",
+    )
+    parser.add_argument(
+        "--state", default=None, help=f"state file (default: <file_name>{STATE_SUFFIX})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes for large tails (default: CPU count)",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    args = parse_args()
+    start = time.time()
+    stats = process_incremental(args.file_name, args.state, args.workers)
+    logging.info(f"Refreshed in {time.time() - start:.2f} seconds")
+    with open_output() as out:
+        write_result(iter_stats(stats), out)
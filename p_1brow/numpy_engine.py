@@ -0,0 +1,176 @@
+"""Pure-Python backend: a memory-mapped file parsed with vectorized NumPy.
+
+The file is walked in newline-aligned chunks. Within a chunk, `;` and `\\n`
+offsets are found with vectorized comparisons, temperatures are decoded from
+their fixed `-?d?d.d` layout straight into integer tenths, and station names
+are dictionary-encoded through a 64-bit hash of their bytes and length. Every
+row's name bytes are then compared against the station its hash resolved to,
+so the rare row whose hash collides with another station's is looked up by
+name instead of being merged into it. No Python object is created per row;
+only per-station state lives in Python.
+"""
+
+import numpy as np
+
+from profiling import span
+
+CHUNK_SIZE = 32 * 1024 * 1024
+SEMICOLON, NEWLINE, MINUS, ZERO = ord(";"), ord("\n"), ord("-"), ord("0")
+HASH_MULTIPLIER = np.uint64(0x100000001B3)
+
+
+class StationTable:
+    """Maps name hashes to dense station codes and holds per-code aggregates."""
+
+    def __init__(self):
+        self.names = []
+        self.codes_by_name = {}
+        # Row `code` holds the bytes of `names[code]`, zero-padded.
+        self.name_bytes = np.zeros((0, 0), dtype=np.uint8)
+        self.name_lengths = np.empty(0, dtype=np.int64)
+        self.known_hashes = np.empty(0, dtype=np.uint64)
+        self.known_codes = np.empty(0, dtype=np.int64)
+        self.mins = np.empty(0, dtype=np.int64)
+        self.maxs = np.empty(0, dtype=np.int64)
+        self.sums = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def codes(self, buf, hashes, starts, ends):
+        """Dense codes for `hashes`, registering stations not seen before."""
+        positions = np.searchsorted(self.known_hashes, hashes)
+        found = positions < len(self.known_hashes)
+        found[found] = self.known_hashes[positions[found]] == hashes[found]
+        if not found.all():
+            new_hashes, first = np.unique(hashes[~found], return_index=True)
+            rows = np.flatnonzero(~found)[first]
+            for value, row in zip(new_hashes.tolist(), rows.tolist()):
+                self._register(value, bytes(buf[starts[row] : ends[row]]))
+            positions = np.searchsorted(self.known_hashes, hashes)
+        codes = self.known_codes[positions]
+
+        for row in self._mismatched(buf, codes, starts, ends).tolist():
+            # A hash collision: this row's station is not the one registered
+            # under its hash.
+            name = bytes(buf[starts[row] : ends[row]])
+            code = self.codes_by_name.get(name)
+            codes[row] = self._add_station(name) if code is None else code
+        return codes
+
+    def _mismatched(self, buf, codes, starts, ends):
+        """Rows whose name bytes differ from those of the station `codes` gives them."""
+        lengths = ends - starts
+        mismatched = self.name_lengths[codes] != lengths
+        width = self.name_bytes.shape[1]
+        expected = self.name_bytes.ravel()
+        offsets = codes * width
+        for k in range(int(lengths.max())):
+            # Whole-column compares, masked to the rows at least k + 1 long,
+            # are cheaper than gathering those rows first.
+            actual = np.take(buf, starts + k, mode="clip")
+            mismatched |= (actual != expected[offsets + k]) & (lengths > k)
+        return np.flatnonzero(mismatched)
+
+    def _register(self, value, name):
+        code = self._add_station(name)
+        order = np.searchsorted(self.known_hashes, value)
+        self.known_hashes = np.insert(self.known_hashes, order, value)
+        self.known_codes = np.insert(self.known_codes, order, code)
+
+    def _add_station(self, name):
+        code = len(self.names)
+        self.names.append(name)
+        self.codes_by_name[name] = code
+
+        width = max(self.name_bytes.shape[1], len(name))
+        row = np.zeros((1, width), dtype=np.uint8)
+        row[0, : len(name)] = np.frombuffer(name, dtype=np.uint8)
+        self.name_bytes = np.vstack(
+            [
+                np.pad(
+                    self.name_bytes, ((0, 0), (0, width - self.name_bytes.shape[1]))
+                ),
+                row,
+            ]
+        )
+        self.name_lengths = np.append(self.name_lengths, len(name))
+        self.mins = np.append(self.mins, np.iinfo(np.int64).max)
+        self.maxs = np.append(self.maxs, np.iinfo(np.int64).min)
+        self.sums = np.append(self.sums, 0)
+        self.counts = np.append(self.counts, 0)
+        return code
+
+    def accumulate(self, codes, tenths):
+        np.minimum.at(self.mins, codes, tenths)
+        np.maximum.at(self.maxs, codes, tenths)
+        self.sums += np.bincount(
+            codes, weights=tenths, minlength=len(self.names)
+        ).astype(np.int64)
+        self.counts += np.bincount(codes, minlength=len(self.names))
+
+    def stats(self):
+        return {
+            name: [int(low), int(high), int(total), int(count)]
+            for name, low, high, total, count in zip(
+                self.names, self.mins, self.maxs, self.sums, self.counts
+            )
+        }
+
+
+def hash_names(buf, starts, ends):
+    """FNV-style hash of each `buf[start:end]`, one byte position per pass."""
+    lengths = ends - starts
+    hashes = lengths.astype(np.uint64)
+    for k in range(int(lengths.max())):
+        active = np.flatnonzero(lengths > k)
+        hashes[active] = (hashes[active] ^ buf[starts[active] + k]) * HASH_MULTIPLIER
+    return hashes
+
+
+def parse_tenths(buf, semicolons, newlines):
+    """Decode each `-?d?d.d` field between `;` and `\\n` into integer tenths."""
+    negative = buf[semicolons + 1] == MINUS
+    digits = newlines - semicolons - 1 - negative
+    tenths = (buf[newlines - 1].astype(np.int64) - ZERO) + 10 * (
+        buf[newlines - 3].astype(np.int64) - ZERO
+    )
+    has_tens = digits == 4
+    tenths[has_tens] += 100 * (buf[newlines[has_tens] - 4].astype(np.int64) - ZERO)
+    tenths[negative] *= -1
+    return tenths
+
+
+def process_chunk(table, buf):
+    """Aggregate a buffer holding only complete, newline-terminated lines."""
+    # Pages of the memory map are read in by the first pass over them, here
+    with span("read+parse", bytes=len(buf)) as parse:
+        newlines = np.flatnonzero(buf == NEWLINE)
+        semicolons = np.flatnonzero(buf == SEMICOLON)
+        starts = np.empty_like(newlines)
+        starts[0] = 0
+        starts[1:] = newlines[:-1] + 1
+
+        tenths = parse_tenths(buf, semicolons, newlines)
+        codes = table.codes(
+            buf, hash_names(buf, starts, semicolons), starts, semicolons
+        )
+        parse.rows = len(newlines)
+
+    with span("aggregate", rows=len(newlines), bytes=0):
+        table.accumulate(codes, tenths)
+
+
+def process_numpy(file_name, chunk_size=CHUNK_SIZE):
+    data = np.memmap(file_name, dtype=np.uint8, mode="r")
+    table = StationTable()
+    start = 0
+    while start < len(data):
+        end = min(start + chunk_size, len(data))
+        if end < len(data):
+            end = start + int(np.flatnonzero(data[start:end] == NEWLINE)[-1]) + 1
+        buf = data[start:end]
+        if buf[-1] != NEWLINE:
+            # The last line of the file may have no trailing newline
+            buf = np.append(buf, np.uint8(NEWLINE))
+        process_chunk(table, buf)
+        start = end
+    return table.stats()
@@ -0,0 +1,89 @@
+"""Streaming writer for the challenge's `{Abha=5.0/18.0/27.4, ...}` result line.
+
+Engines hand over station-sorted batches of `(station, min, max, sum, count)`
+rows in integer tenths, either fetched from a DuckDB cursor with `fetchmany`
+or sliced from an aggregate dict. Each batch is formatted and written as it
+arrives, so the full result never exists as a list of Python tuples.
+"""
+
+import contextlib
+import sys
+
+from profiling import explain_analyze, span
+from stats import mean_tenths
+
+BATCH_SIZE = 2048
+BUFFER_SIZE = 1024 * 1024
+
+
+def format_tenths(tenths):
+    """Integer tenths as a one-decimal number, without a float round trip."""
+    sign = "-" if tenths < 0 else ""
+    tenths = abs(tenths)
+    return f"{sign}{tenths // 10}.{tenths % 10}"
+
+
+def format_station(station, low, high, total, count):
+    if isinstance(station, bytes):
+        station = station.decode("utf-8")
+    return f"{station}={format_tenths(low)}/{format_tenths(mean_tenths(total, count))}/{format_tenths(high)}"
+
+
+def iter_stats(stats, batch_size=BATCH_SIZE):
+    """Station-sorted batches of rows from a `{station: [min, max, sum, count]}` dict."""
+    # Sorted now rather than on the first batch, so the sort is timed on its own
+    with span("sort", rows=len(stats), bytes=0):
+        stations = sorted(stats)
+    return (
+        [(station, *stats[station]) for station in stations[i : i + batch_size]]
+        for i in range(0, len(stations), batch_size)
+    )
+
+
+def iter_cursor(con, query, phase="aggregate+sort", batch_size=BATCH_SIZE):
+    """Run the sorted `query` now and return its rows in batches; closes `con` when done."""
+    try:
+        explain_analyze(con, query)
+        with span(phase):
+            cursor = con.execute(query)
+    except Exception:
+        con.close()
+        raise
+    return _fetch_batches(con, cursor, batch_size)
+
+
+def _fetch_batches(con, cursor, batch_size):
+    try:
+        while batch := cursor.fetchmany(batch_size):
+            yield batch
+    finally:
+        con.close()
+
+
+@contextlib.contextmanager
+def open_output(file_name=None):
+    """A buffered text stream for `file_name`, or stdout for None or `-`."""
+    if file_name in (None, "-"):
+        yield sys.stdout
+        sys.stdout.flush()
+        return
+    with open(file_name, "w", encoding="utf-8", buffering=BUFFER_SIZE) as out:
+        yield out
+
+
+def write_result(batches, out):
+    """Write the result line; returns the number of stations and measurements."""
+    stations = measurements = 0
+    with span("output", bytes=0) as output:
+        out.write("{")
+        for batch in batches:
+            if not batch:
+                continue
+            if stations:
+                out.write(", ")
+            out.write(", ".join(format_station(*row) for row in batch))
+            stations += len(batch)
+            measurements += sum(row[-1] for row in batch)
+        out.write("}\n")
+        output.rows = stations
+    return stations, measurements
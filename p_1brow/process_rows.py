@@ -1,61 +1,179 @@
+import argparse
 import duckdb
+import os
 import time
 import logging
 import sys
 
+from chunked import process_chunked
+from incremental import process_incremental
+from output import iter_cursor, iter_stats, open_output, write_result
+from profiling import FORMATS, set_input, span, start_profiling, write_profile
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def process_weather_data(file_name):
+ENGINES = ("duckdb", "duckdb-stream", "chunked", "numpy", "columnar", "incremental")
+
+# Aggregates in integer tenths, matching stats.py, so every engine rounds alike
+AGGREGATES = """
+    CAST(ROUND(MIN(temperature) * 10) AS BIGINT) AS min,
+    CAST(ROUND(MAX(temperature) * 10) AS BIGINT) AS max,
+    SUM(CAST(ROUND(temperature * 10) AS BIGINT)) AS sum,
+    COUNT(*) AS count
+"""
+
+
+def connect(threads=None, memory_limit=None, database=':memory:', read_only=False):
+    """Create a DuckDB connection (in-memory by default) with explicit resource settings."""
+    con = duckdb.connect(database=database, read_only=read_only)
+    if threads:
+        con.execute(f"SET threads = {int(threads)}")
+    if memory_limit:
+        con.execute(f"SET memory_limit = '{memory_limit}'")
+    return con
+
+
+def read_measurements(file_name):
+    """A `read_csv` call with the format spelled out, so nothing is sniffed."""
+    return f"""read_csv('{file_name}', delim=';', header=false,
+                        columns={{'station': 'VARCHAR', 'temperature': 'DOUBLE'}})"""
+
+
+def process_duckdb(file_name, threads=None, memory_limit=None):
     logging.info(f"Reading file {file_name} into a DuckDB table")
-    total_time = time.time()
 
-    try:
-        # Create an in-memory DuckDB connection
-        con = duckdb.connect(database=':memory:', read_only=False)
-        
-        # Timing the file read process
-        start = time.time()
+    # Create an in-memory DuckDB connection
+    con = connect(threads, memory_limit)
+
+    # Timing the file read process
+    start = time.time()
+    with span("read+parse"):
         con.execute(f"""
         CREATE TABLE measurements AS
         SELECT * FROM read_csv('{file_name}', columns=STRUCT_PACK(station := 'TEXT', temperature := 'DOUBLE'))
         """)
-        logging.info(f"Data read into a DuckDB table in {time.time() - start:.2f} seconds")
-        
-        # Log the schema and sample data
-        logging.info(f"Schema:\n{con.execute('DESCRIBE measurements').fetchall()}")
-        logging.info(f"Sample of data:\n{con.execute('SELECT * FROM measurements LIMIT 5').fetchall()}")
-        logging.info(f"Total number of measurements: {con.execute('SELECT count(*) FROM measurements').fetchone()[0]}")
-        
-        # Group data and calculate statistics
-        con.execute("""CREATE VIEW grouped AS
-                        SELECT
-                        station,
-                        MIN(temperature) AS min,
-                        ROUND(AVG(temperature), 1) AS mean,
-                        MAX(temperature) AS max
-                        FROM measurements
-                        GROUP BY station""")
-        
+    logging.info(f"Data read into a DuckDB table in {time.time() - start:.2f} seconds")
+
+    # Log the schema and sample data
+    logging.info(f"Schema:\n{con.execute('DESCRIBE measurements').fetchall()}")
+    logging.info(f"Sample of data:\n{con.execute('SELECT * FROM measurements LIMIT 5').fetchall()}")
+    logging.info(f"Total number of measurements: {con.execute('SELECT count(*) FROM measurements').fetchone()[0]}")
+
+    # Group data and calculate statistics
+    con.execute(f"""CREATE VIEW grouped AS
+                    SELECT station, {AGGREGATES}
+                    FROM measurements
+                    GROUP BY station""")
+
+    # Rows are fetched in batches as they are written; the connection closes after the last one
+    return iter_cursor(con, "SELECT * FROM grouped ORDER BY station")
+
+
+def process_duckdb_stream(file_name, threads=None, memory_limit=None, diagnostics=False):
+    """Aggregate straight off the CSV scan in a single pass, without a table."""
+    logging.info(f"Aggregating {file_name} directly from the CSV scan")
+    con = connect(threads, memory_limit)
+
+    if diagnostics:
+        # LIMIT stops the scan early, so this only reads the head of the file
+        relation = con.sql(f"SELECT * FROM {read_measurements(file_name)} LIMIT 5")
+        logging.info(f"Schema:\n{list(zip(relation.columns, relation.types))}")
+        logging.info(f"Sample of data:\n{relation.fetchall()}")
+
+    return iter_cursor(con, f"""SELECT station, {AGGREGATES}
+                                FROM {read_measurements(file_name)}
+                                GROUP BY station
+                                ORDER BY station""", phase="read+parse+aggregate+sort")
+
+
+def process_weather_data(file_name, engine="duckdb", workers=None, threads=None,
+                         memory_limit=None, diagnostics=False, cache_path=None, state_path=None,
+                         output=None, profile=None, profile_format="json", explain_analyze=False):
+    total_time = time.time()
+    if profile:
+        start_profiling(explain_analyze)
+
+    try:
         start = time.time()
-        summary = con.execute("SELECT * FROM grouped ORDER BY station").fetchall()
-        logging.info(f"Summary calculated in {time.time() - start:.2f} seconds")
+        if engine == "chunked":
+            workers = workers or os.cpu_count()
+            logging.info(f"Aggregating {file_name} in {workers} worker processes")
+            with span("read+parse+aggregate"):
+                stats = process_chunked(file_name, workers)
+            batches = iter_stats(stats)
+        elif engine == "numpy":
+            # Imported here so the other engines do not require NumPy
+            from numpy_engine import process_numpy
+            logging.info(f"Parsing memory-mapped {file_name} with NumPy")
+            batches = iter_stats(process_numpy(file_name))
+        elif engine == "columnar":
+            # Imported here because columnar.py builds on this module's helpers
+            from columnar import process_columnar
+            batches = process_columnar(file_name, cache_path, threads, memory_limit)
+        elif engine == "incremental":
+            batches = iter_stats(process_incremental(file_name, state_path, workers))
+        elif engine == "duckdb-stream":
+            batches = process_duckdb_stream(file_name, threads, memory_limit, diagnostics)
+        else:
+            batches = process_duckdb(file_name, threads, memory_limit)
+
+        with open_output(output) as out:
+            stations, measurements = write_result(batches, out)
+        # The row count falls out of the aggregates instead of another scan
+        logging.info(f"Wrote {stations} stations from {measurements} measurements "
+                     f"in {time.time() - start:.2f} seconds")
         logging.info(f"Total time: {time.time() - total_time:.2f} seconds")
-        
-        # Log the first 20 stations' summary
-        logging.info(f"Summary of first 20 stations:\n{summary[:20]}")
-        
-        # Close the connection
-        con.close()
+
+        if profile:
+            set_input(rows=measurements, bytes=os.path.getsize(file_name))
+            write_profile(profile, profile_format)
+            logging.info(f"Wrote {profile_format} profile to {profile}")
+        return stations
 
     except Exception as e:
         logging.error(f"Error processing file {file_name}: {str(e)}")
         sys.exit(1)
 
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compute min/mean/max temperature per weather station.")
+    parser.add_argument("file_name", help="measurements file with one `station;temperature` row per line")
+    parser.add_argument("--engine", choices=ENGINES, default="duckdb",
+                        help="duckdb: load into an in-memory DuckDB table; "
+                             "duckdb-stream: aggregate directly over the CSV scan in one pass; "
+                             "chunked: aggregate byte ranges in parallel worker processes; "
+                             "numpy: parse a memory-mapped file with vectorized NumPy; "
+                             "columnar: aggregate a cached columnar copy, parsing the CSV only when it changes; "
+                             "incremental: merge only the lines appended since the last run into stored aggregates")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for the chunked and incremental engines (default: CPU count)")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="DuckDB worker threads (default: DuckDB's own choice)")
+    parser.add_argument("--memory-limit", default=None,
+                        help="DuckDB memory limit, e.g. 4GB (default: DuckDB's own choice)")
+    parser.add_argument("--diagnostics", action="store_true",
+                        help="log the schema and a sample of rows (duckdb-stream)")
+    parser.add_argument("--cache", default=None,
+                        help="columnar cache database (default: <file_name>.duckdb)")
+    parser.add_argument("--state", default=None,
+                        help="incremental aggregate state (default: <file_name>.state.json)")
+    parser.add_argument("--output", default=None,
+                        help="write the result line to this file instead of stdout")
+    parser.add_argument("--profile", default=None,
+                        help="write per-phase wall/CPU time, bytes and rows/sec to this file")
+    parser.add_argument("--profile-format", choices=FORMATS, default="json",
+                        help="json: per-phase totals; chrome: trace events for chrome://tracing or Perfetto")
+    parser.add_argument("--explain-analyze", action="store_true",
+                        help="add DuckDB's EXPLAIN ANALYZE plan of the aggregation to the profile "
+                             "(runs that query a second time)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        logging.error("Usage: python script_name.py <file_name>")
-        sys.exit(1)
-        
-    input_file = sys.argv[1]
-    process_weather_data(input_file)
\ No newline at end of file
+    args = parse_args()
+    process_weather_data(args.file_name, engine=args.engine, workers=args.workers,
+                         threads=args.threads, memory_limit=args.memory_limit,
+                         diagnostics=args.diagnostics, cache_path=args.cache, state_path=args.state,
+                         output=args.output, profile=args.profile, profile_format=args.profile_format,
+                         explain_analyze=args.explain_analyze)
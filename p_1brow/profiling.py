@@ -0,0 +1,161 @@
+"""Phase-level instrumentation for the processing pipeline.
+
+Engines wrap their phases in `span(...)` blocks named after what they do:
+`read`, `parse`, `aggregate`, `sort` and `output`, joined with `+` where an
+engine fuses phases (DuckDB reads, parses and aggregates a CSV in a single
+operator pipeline). Each span records wall and CPU time, including the CPU of
+reaped worker processes, plus the bytes and rows it processed. Spans are
+no-ops until `start_profiling` is called, so the engines carry them at no
+cost; a span entered several times, such as a per-chunk phase, is summed in
+the JSON report and kept as separate events in the Chrome trace.
+"""
+
+import contextlib
+import json
+import os
+import resource
+import time
+
+FORMATS = ("json", "chrome")
+
+_profiler = None
+
+
+class Span:
+    def __init__(self, name, rows=None, bytes=None):
+        self.name = name
+        self.rows = rows
+        self.bytes = bytes
+        self.start = 0.0
+        self.wall = 0.0
+        self.cpu = 0.0
+
+
+class Profiler:
+    def __init__(self, explain=False):
+        self.explain = explain
+        self.spans = []
+        self.plans = []
+        self.start = time.perf_counter()
+        # Totals that spans over the whole input fall back to
+        self.input_rows = None
+        self.input_bytes = None
+
+    def _rows(self, span):
+        return (self.input_rows or 0) if span.rows is None else span.rows
+
+    def _bytes(self, span):
+        return (self.input_bytes or 0) if span.bytes is None else span.bytes
+
+    def report(self):
+        phases = {}
+        for span in self.spans:
+            phase = phases.setdefault(
+                span.name,
+                {
+                    "name": span.name,
+                    "calls": 0,
+                    "wall_seconds": 0.0,
+                    "cpu_seconds": 0.0,
+                    "rows": 0,
+                    "bytes": 0,
+                },
+            )
+            phase["calls"] += 1
+            phase["wall_seconds"] += span.wall
+            phase["cpu_seconds"] += span.cpu
+            phase["rows"] += self._rows(span)
+            phase["bytes"] += self._bytes(span)
+
+        for phase in phases.values():
+            wall = phase["wall_seconds"]
+            phase["rows_per_second"] = phase["rows"] / wall if wall else None
+            phase["mb_per_second"] = phase["bytes"] / 2**20 / wall if wall else None
+        return {
+            "total_wall_seconds": time.perf_counter() - self.start,
+            "input_rows": self.input_rows,
+            "input_bytes": self.input_bytes,
+            "phases": list(phases.values()),
+            "explain_analyze": self.plans,
+        }
+
+    def chrome_trace(self):
+        """The spans as complete ("X") events of the Chrome trace event format."""
+        events = [
+            {
+                "name": span.name,
+                "ph": "X",
+                "ts": (span.start - self.start) * 1e6,
+                "dur": span.wall * 1e6,
+                "pid": os.getpid(),
+                "tid": 0,
+                "args": {
+                    "cpu_seconds": span.cpu,
+                    "rows": self._rows(span),
+                    "bytes": self._bytes(span),
+                },
+            }
+            for span in self.spans
+        ]
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if self.plans:
+            trace["otherData"] = {"explain_analyze": self.plans}
+        return trace
+
+
+def _cpu_seconds():
+    # Children only count once reaped, which the process pools do on exit
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def start_profiling(explain=False):
+    global _profiler
+    _profiler = Profiler(explain)
+    return _profiler
+
+
+@contextlib.contextmanager
+def span(name, rows=None, bytes=None):
+    """Time a phase. Leave `rows`/`bytes` as None when the phase covers the whole
+    input, or set them on the yielded span once they are known."""
+    current = Span(name, rows, bytes)
+    if _profiler is None:
+        yield current
+        return
+    current.start = time.perf_counter()
+    cpu = _cpu_seconds()
+    try:
+        yield current
+    finally:
+        current.wall = time.perf_counter() - current.start
+        current.cpu = _cpu_seconds() - cpu
+        _profiler.spans.append(current)
+
+
+def set_input(rows=None, bytes=None):
+    if _profiler is not None:
+        _profiler.input_rows = rows
+        _profiler.input_bytes = bytes
+
+
+def explain_analyze(con, query):
+    """Capture DuckDB's EXPLAIN ANALYZE profile of `query` when requested.
+
+    This runs the query an extra time, outside of any span."""
+    if _profiler is None or not _profiler.explain:
+        return
+    plan = con.execute(f"EXPLAIN ANALYZE {query}").fetchall()
+    _profiler.plans.append(
+        {"query": query.strip(), "plan": "\n".join(row[1] for row in plan)}
+    )
+
+
+def write_profile(file_name, format="json"):
+    with open(file_name, "w") as f:
+        json.dump(
+            _profiler.chrome_trace() if format == "chrome" else _profiler.report(),
+            f,
+            indent=2,
+        )
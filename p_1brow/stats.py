@@ -0,0 +1,40 @@
+"""Per-station aggregates shared by the processing engines.
+
+Temperatures are kept as integer tenths of a degree, so partial results from
+different workers merge exactly and every engine rounds the mean the same way.
+"""
+
+# Index of each aggregate in a station's [min, max, sum, count] list.
+MIN, MAX, SUM, COUNT = range(4)
+
+
+def merge_stats(into, other):
+    """Fold the per-station aggregates of `other` into `into`."""
+    for station, (low, high, total, count) in other.items():
+        current = into.get(station)
+        if current is None:
+            into[station] = [low, high, total, count]
+            continue
+        if low < current[MIN]:
+            current[MIN] = low
+        if high > current[MAX]:
+            current[MAX] = high
+        current[SUM] += total
+        current[COUNT] += count
+    return into
+
+
+def mean_tenths(total, count):
+    """The mean in tenths, rounded half up as the challenge specifies."""
+    return (2 * total + count) // (2 * count)
+
+
+def summarize(stats):
+    """Turn aggregates into sorted `(station, min, mean, max)` rows in degrees."""
+    rows = []
+    for station, (low, high, total, count) in stats.items():
+        if isinstance(station, bytes):
+            station = station.decode("utf-8")
+        rows.append((station, low / 10, mean_tenths(total, count) / 10, high / 10))
+    rows.sort()
+    return rows
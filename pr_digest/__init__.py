@@ -0,0 +1,4 @@
+"""Build a blog-post digest of a pull request and have Claude write it.
+
+Used by the `Blog Post Generator for PRs` workflow; see `python -m pr_digest --help`.
+"""
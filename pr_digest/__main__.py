@@ -0,0 +1,168 @@
+"""Write a blog post about a pull request.
+
+In a GitHub Actions `pull_request` run, everything comes from the environment:
+
+    python -m pr_digest --output blog_post.txt
+
+Locally, against a checked-out repository and, e.g., a stub model endpoint:
+
+    python -m pr_digest --local --base main --head my-branch --api-url http://localhost:8080
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import replace
+
+from . import git, github
+from .compact import DIFF_BUDGET, compact_diff
+from .digest import CLAUDE_API_URL, MODEL, Digest, generate, request_payload
+
+
+def _event_pull_request() -> dict:
+    event_path = os.environ.get("GITHUB_EVENT_PATH")
+    if not event_path:
+        return {}
+    with open(event_path) as f:
+        return json.load(f).get("pull_request") or {}
+
+
+def remote_digest(
+    args: argparse.Namespace,
+) -> Digest:
+    """Metadata and commits from the API once, the diff from a targeted fetch."""
+    token = os.environ["GITHUB_TOKEN"]
+    api_url = os.environ.get("GITHUB_API_URL", github.GITHUB_API_URL)
+    pull_request = _event_pull_request()
+    number = args.pr or pull_request.get("number")
+    if not number:
+        raise SystemExit(
+            "No pull request number: pass --pr or run on a pull_request event"
+        )
+    if not pull_request:
+        pull_request = github.fetch_pull_request(
+            api_url, args.repository, number, token
+        )
+
+    commits = github.fetch_commits(api_url, args.repository, number, token)
+    head = pull_request["head"]["sha"]
+    # Diffing from the merge base keeps the diff to the pull request's own
+    # changes, even if the base moved on or was merged into the branch.
+    base = github.fetch_merge_base(
+        api_url,
+        args.repository,
+        pull_request["base"]["sha"],
+        head,
+        token,
+    )
+    git.fetch_commits([base, head], cwd=args.repo_path)
+
+    return Digest.from_commits(
+        pull_request["title"],
+        pull_request["body"],
+        commits,
+        git.diff(base, head, cwd=args.repo_path),
+    )
+
+
+def local_digest(
+    args: argparse.Namespace,
+) -> Digest:
+    base = git.merge_base(args.base, args.head, cwd=args.repo_path)
+    commits = git.log_commits(base, args.head, cwd=args.repo_path)
+    title = args.title or (
+        commits[-1]["message"].splitlines()[0] if commits else args.head
+    )
+    return Digest.from_commits(
+        title,
+        args.body,
+        commits,
+        git.diff(base, args.head, cwd=args.repo_path),
+    )
+
+
+def parse_args(
+    argv: list[str] | None = None,
+) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="pr_digest", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "--repository", default=os.environ.get("GITHUB_REPOSITORY"), help="owner/name"
+    )
+    parser.add_argument(
+        "--pr",
+        type=int,
+        default=None,
+        help="pull request number (default: from the event)",
+    )
+    parser.add_argument(
+        "--repo-path", default=None, help="git checkout to diff in (default: cwd)"
+    )
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="digest --base..--head of the local checkout",
+    )
+    parser.add_argument("--base", default="main", help="base ref in --local mode")
+    parser.add_argument("--head", default="HEAD", help="head ref in --local mode")
+    parser.add_argument(
+        "--title",
+        default=None,
+        help="title in --local mode (default: last commit subject)",
+    )
+    parser.add_argument("--body", default="", help="description in --local mode")
+    parser.add_argument(
+        "--api-url",
+        default=os.environ.get("CLAUDE_API_URL", CLAUDE_API_URL),
+        help="model endpoint base URL, e.g. a local stub",
+    )
+    parser.add_argument("--model", default=MODEL)
+    parser.add_argument(
+        "--max-diff-tokens",
+        type=int,
+        default=DIFF_BUDGET,
+        help="compact the diff to about this many tokens, most relevant hunks first",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="print the request payload instead of sending it",
+    )
+    parser.add_argument(
+        "--output", default=None, help="write the blog post here (default: stdout)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(
+    argv: list[str] | None = None,
+) -> int:
+    args = parse_args(argv)
+    digest = local_digest(args) if args.local else remote_digest(args)
+    diff_bytes = len(digest.diff)
+    digest = replace(digest, diff=compact_diff(digest.diff, args.max_diff_tokens))
+    payload = request_payload(digest, args.model)
+    print(
+        f"Digest: {len(digest.commit_messages)} commits, {len(digest.contributors)} contributors, "
+        f"{diff_bytes} diff bytes compacted to {len(digest.diff)}, {len(payload)} payload bytes",
+        file=sys.stderr,
+    )
+    if args.dry_run:
+        sys.stdout.buffer.write(payload + b"\n")
+        return 0
+
+    post = generate(payload, os.environ.get("CLAUDE_API_KEY", ""), args.api_url)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(post + "\n")
+    else:
+        print(post)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
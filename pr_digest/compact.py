@@ -0,0 +1,341 @@
+"""Shrink a unified diff to a token budget, keeping the changes that matter.
+
+Lockfiles, vendored code and binaries are always dropped. A diff that then
+fits the budget is kept whole. Otherwise generated code and deleted files go
+too, the remaining hunks are ranked by how much real code they change,
+weighted by the kind of file they are in, and the budget is filled
+best-first. The diff keeps its original order, with `...` where hunks were
+left out.
+"""
+
+from __future__ import annotations
+
+import math
+import posixpath
+import re
+from dataclasses import dataclass, field
+
+DIFF_BUDGET = 12_000
+# A hunk that does not fit is truncated if at least this much budget is left.
+MIN_PARTIAL_TOKENS = 200
+# Longer hunks (a new file is a single hunk) are split at blank lines into
+# pieces of about this many lines, so they are ranked piece by piece.
+MAX_HUNK_LINES = 40
+# Omitted files are listed by name up to this many.
+MAX_LISTED_OMISSIONS = 20
+
+LOCKFILES = {
+    "package-lock.json",
+    "npm-shrinkwrap.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "bun.lockb",
+    "poetry.lock",
+    "Pipfile.lock",
+    "uv.lock",
+    "pdm.lock",
+    "Cargo.lock",
+    "go.sum",
+    "Gemfile.lock",
+    "composer.lock",
+    "mix.lock",
+    "pubspec.lock",
+    "Podfile.lock",
+    "flake.lock",
+    "packages.lock.json",
+}
+VENDORED = re.compile(
+    r"(^|/)(vendor|vendored|third_party|node_modules|bower_components|site-packages)/"
+)
+GENERATED = re.compile(
+    r"(\.min\.(js|css)|\.map|\.snap|_pb2(_grpc)?\.pyi?|\.pb\.go|\.generated\.\w+|\.g\.dart)$"
+    r"|(^|/)(dist|build|__generated__|generated)/",
+)
+GENERATED_MARKER = re.compile(r"@generated|DO NOT EDIT|auto-?generated", re.IGNORECASE)
+# Lines at the top of a file searched for a generated-code marker.
+MARKER_LINES = 5
+# Dropped even when the whole diff fits the budget.
+ALWAYS_SKIPPED = {"lockfile", "vendored", "binary"}
+
+CODE = {
+    ".py",
+    ".pyi",
+    ".js",
+    ".jsx",
+    ".ts",
+    ".tsx",
+    ".go",
+    ".rs",
+    ".java",
+    ".kt",
+    ".scala",
+    ".rb",
+    ".php",
+    ".c",
+    ".h",
+    ".cc",
+    ".cpp",
+    ".hpp",
+    ".cs",
+    ".swift",
+    ".m",
+    ".sql",
+    ".sh",
+    ".vue",
+    ".svelte",
+}
+CONFIG = {".yml", ".yaml", ".toml", ".json", ".ini", ".cfg", ".xml", ".gradle", ".tf"}
+DOCS = {".md", ".mdx", ".rst", ".txt", ".adoc"}
+TEST_PATH = re.compile(
+    r"(^|/)(tests?|spec|__tests__)/|(^|/)test_|_test\.\w+$|\.(test|spec)\.\w+$"
+)
+# Changed lines the prompt asks the model to leave out anyway.
+BOILERPLATE = re.compile(
+    r"^\s*($|#|//|/\*|\*|import\s|from\s+\S+\s+import\s|using\s|require\(|#include"
+    r"|.*\b(logging|logger|log|console)\.(debug|info|warn|warning|error|exception|log)\("
+    r"|print\()",
+)
+
+
+def count_tokens(
+    text: str,
+) -> int:
+    """Roughly four characters per token; good enough to size a budget."""
+    return math.ceil(len(text) / 4)
+
+
+@dataclass
+class Hunk:
+    text: str
+    score: float
+    tokens: int
+
+
+@dataclass
+class FileDiff:
+    path: str
+    header: str
+    hunks: list[Hunk] = field(default_factory=list)
+    skip_reason: str | None = None
+
+
+def _language_weight(
+    path: str,
+) -> float:
+    extension = posixpath.splitext(path)[1].lower()
+    if extension in CODE:
+        weight = 1.0
+    elif extension in CONFIG:
+        weight = 0.5
+    elif extension in DOCS:
+        weight = 0.3
+    else:
+        weight = 0.6
+    return weight * 0.7 if TEST_PATH.search(path) else weight
+
+
+def _score(
+    path: str,
+    text: str,
+) -> float:
+    changed = [
+        line[1:]
+        for line in text.splitlines()
+        if line[:1] in "+-" and not line.startswith(("+++", "---"))
+    ]
+    meaningful = sum(1 for line in changed if not BOILERPLATE.match(line))
+    # Bigger changes rank higher, with diminishing returns so that one huge
+    # hunk does not outrank everything else.
+    return _language_weight(path) * math.log1p(meaningful)
+
+
+def _skip_reason(
+    path: str,
+    header: str,
+    body: str,
+) -> str | None:
+    if "Binary files " in header or "GIT binary patch" in header:
+        return "binary"
+    if "\ndeleted file mode" in header:
+        return "deleted"
+    if posixpath.basename(path) in LOCKFILES:
+        return "lockfile"
+    if VENDORED.search(path):
+        return "vendored"
+    if GENERATED.search(path) or GENERATED_MARKER.search(_file_top(header, body)):
+        return "generated"
+    return None
+
+
+def _file_top(
+    header: str,
+    body: str,
+) -> str:
+    """The first lines of the file where the diff shows them, changes excluded.
+
+    That is the added lines of a new file, or the leading context of a hunk
+    starting at the top of an existing one. Lines a change adds elsewhere are
+    not searched, so a real source file mentioning the marker words in its
+    changes is not mistaken for generated code.
+    """
+    lines = body.splitlines()
+    if not lines or not re.match(r"@@ -[01][, ]", lines[0]):
+        return ""
+    prefix = "+" if "\nnew file mode" in header else " "
+    top = []
+    for line in lines[1 : MARKER_LINES + 1]:
+        if not line.startswith(prefix):
+            break
+        top.append(line[1:])
+    return "\n".join(top)
+
+
+def _split_hunk(
+    text: str,
+) -> list[str]:
+    lines = text.splitlines(keepends=True)
+    pieces = []
+    start = 0
+    for index, line in enumerate(lines):
+        if index - start >= MAX_HUNK_LINES and line[1:].strip() == "":
+            pieces.append("".join(lines[start : index + 1]))
+            start = index + 1
+    if start < len(lines):
+        pieces.append("".join(lines[start:]))
+    return pieces
+
+
+def parse_diff(
+    diff: str,
+) -> list[FileDiff]:
+    files = []
+    for chunk in re.split(r"^(?=diff --git )", diff, flags=re.MULTILINE):
+        if not chunk.startswith("diff --git "):
+            continue
+        header, _, body = chunk.partition("\n@@")
+        body = "@@" + body if body else ""
+        match = re.search(r"^\+\+\+ b/(.+)$", header, re.MULTILINE) or re.match(
+            r"diff --git a/.+? b/(.+)$",
+            header,
+            re.MULTILINE,
+        )
+        path = match[1] if match else header.split()[-1]
+        # The `index` line is noise to the model.
+        kept_header = "\n".join(
+            line for line in header.splitlines() if not line.startswith("index ")
+        )
+        file_diff = FileDiff(
+            path, kept_header + "\n", skip_reason=_skip_reason(path, header, body)
+        )
+        for hunk in re.split(r"^(?=@@)", body, flags=re.MULTILINE):
+            for text in _split_hunk(hunk):
+                file_diff.hunks.append(
+                    Hunk(text, _score(path, text), count_tokens(text))
+                )
+        files.append(file_diff)
+    return files
+
+
+def _truncate(
+    text: str,
+    tokens: int,
+) -> str:
+    lines = []
+    used = 0
+    for line in text.splitlines(keepends=True):
+        used += count_tokens(line)
+        if used > tokens:
+            break
+        lines.append(line)
+    return "".join(lines) + "...\n"
+
+
+def compact_diff(
+    diff: str,
+    budget: int = DIFF_BUDGET,
+) -> str:
+    """`diff` without the noise, cut down to about `budget` tokens."""
+    files = parse_diff(diff)
+    if count_tokens(diff) <= budget:
+        return _render(
+            [
+                file_diff
+                for file_diff in files
+                if file_diff.skip_reason not in ALWAYS_SKIPPED
+            ],
+            {id(hunk): hunk.text for file_diff in files for hunk in file_diff.hunks},
+            [
+                file_diff
+                for file_diff in files
+                if file_diff.skip_reason in ALWAYS_SKIPPED
+            ],
+        )
+
+    kept = [file_diff for file_diff in files if file_diff.skip_reason is None]
+    remaining = budget
+    chosen: dict[int, str] = {}
+    headed: set[int] = set()
+    # Best first; among equals the smaller hunk, which leaves room for more.
+    # Boilerplate-only hunks score 0 and so come last.
+    ranked = sorted(
+        ((hunk, file_diff) for file_diff in kept for hunk in file_diff.hunks),
+        key=lambda item: (-item[0].score, item[0].tokens),
+    )
+    for hunk, file_diff in ranked:
+        # A file's header is paid for with its first chosen hunk.
+        cost = hunk.tokens + (
+            0 if id(file_diff) in headed else count_tokens(file_diff.header)
+        )
+        if cost <= remaining:
+            chosen[id(hunk)] = hunk.text
+            remaining -= cost
+        elif remaining - (cost - hunk.tokens) >= MIN_PARTIAL_TOKENS:
+            chosen[id(hunk)] = _truncate(hunk.text, remaining - (cost - hunk.tokens))
+            remaining = 0
+        else:
+            continue
+        headed.add(id(file_diff))
+
+    shown = [
+        file_diff
+        for file_diff in kept
+        if any(id(hunk) in chosen for hunk in file_diff.hunks)
+    ]
+    shown_ids = {id(file_diff) for file_diff in shown}
+    return _render(
+        shown,
+        chosen,
+        [file_diff for file_diff in files if id(file_diff) not in shown_ids],
+    )
+
+
+def _render(
+    shown: list[FileDiff],
+    chosen: dict[int, str],
+    omitted: list[FileDiff],
+) -> str:
+    """`shown` files with their `chosen` hunk texts, then the `omitted` files."""
+    parts = []
+    for file_diff in shown:
+        parts.append(file_diff.header)
+        elided = False
+        for hunk in file_diff.hunks:
+            if id(hunk) in chosen:
+                parts.append(chosen[id(hunk)])
+                elided = False
+            elif not elided:
+                parts.append("...\n")
+                elided = True
+
+    if omitted:
+        listed = ", ".join(
+            f"{file_diff.path} ({file_diff.skip_reason or 'low priority'})"
+            for file_diff in omitted[:MAX_LISTED_OMISSIONS]
+        )
+        more = len(omitted) - MAX_LISTED_OMISSIONS
+        parts.append(
+            f"... omitted {len(omitted)} file{'' if len(omitted) == 1 else 's'}: {listed}"
+            + (f" and {more} more" if more > 0 else "")
+            + "\n"
+        )
+    return "".join(parts)
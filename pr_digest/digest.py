@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import urllib.request
+from dataclasses import dataclass
+from typing import Any
+
+CLAUDE_API_URL = "https://api.anthropic.com"
+ANTHROPIC_VERSION = "2023-06-01"
+MODEL = "claude-3-5-sonnet-20240620"
+MAX_TOKENS = 1024
+
+INSTRUCTIONS = (
+    "Mention contributors and thank you them. Highlight and inline into blogpost "
+    "key code change as code section. Omit any unnecessary/or boilerplate or "
+    "repetitive sections and use ... to indicate omitted code if needed. no need "
+    "to show imports, logging or exception processing etc. Provide a short "
+    "explanation of what the key logic does. no more than 20 lines. If PR doesn't "
+    "include code change (or any code), don't include it to blogpost."
+)
+
+
+@dataclass(frozen=True)
+class Digest:
+    """Everything about a pull request that goes into the prompt."""
+
+    title: str
+    body: str
+    commit_messages: list[str]
+    contributors: list[str]
+    diff: str
+
+    @classmethod
+    def from_commits(
+        cls,
+        title: str,
+        body: str | None,
+        commits: list[dict[str, Any]],
+        diff: str,
+    ) -> Digest:
+        return cls(
+            title=title,
+            body=body or "",
+            commit_messages=[commit["message"] for commit in commits],
+            # Each contributor once, in order of their first commit.
+            contributors=list(dict.fromkeys(commit["author"] for commit in commits)),
+            diff=diff,
+        )
+
+    def prompt(self) -> str:
+        commits = "\n".join(
+            f"- {message.splitlines()[0]}"
+            for message in self.commit_messages
+            if message
+        )
+        return (
+            "Write a blog post summarizing the following contribution:\n"
+            f"Title: {self.title}\n"
+            f"Description:\n{self.body}\n"
+            f"Commits:\n{commits}\n"
+            f"Code changes:\n{self.diff}\n"
+            f"Contributors: {', '.join(self.contributors)}\n\n"
+            f"{INSTRUCTIONS}"
+        )
+
+
+def request_payload(
+    digest: Digest,
+    model: str = MODEL,
+    max_tokens: int = MAX_TOKENS,
+) -> bytes:
+    """The Messages API request body, serialized once."""
+    return json.dumps(
+        {
+            "model": model,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": digest.prompt()}],
+        },
+    ).encode()
+
+
+def generate(
+    payload: bytes,
+    api_key: str,
+    api_url: str = CLAUDE_API_URL,
+) -> str:
+    request = urllib.request.Request(
+        f"{api_url.rstrip('/')}/v1/messages",
+        data=payload,
+        headers={
+            "anthropic-version": ANTHROPIC_VERSION,
+            "content-type": "application/json",
+            "x-api-key": api_key,
+        },
+    )
+    with urllib.request.urlopen(request) as response:
+        message = json.load(response)
+
+    return "".join(
+        block["text"] for block in message["content"] if block["type"] == "text"
+    )
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import subprocess
+from typing import Any
+
+# Separates the fields and records of `git log` output in `log_commits`.
+FIELD = "\x1f"
+RECORD = "\x1e"
+
+
+def run_git(
+    *args: str,
+    cwd: str | None = None,
+) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def has_commit(
+    sha: str,
+    cwd: str | None = None,
+) -> bool:
+    return (
+        subprocess.run(
+            ["git", "cat-file", "-e", f"{sha}^{{commit}}"],
+            cwd=cwd,
+            capture_output=True,
+        ).returncode
+        == 0
+    )
+
+
+def fetch_commits(
+    shas: list[str],
+    remote: str = "origin",
+    cwd: str | None = None,
+) -> None:
+    """Fetch just these commits, one level deep, unless they are already here.
+
+    Diffing two commits only needs their trees, so this replaces fetching
+    every branch with its full history.
+    """
+    missing = [sha for sha in dict.fromkeys(shas) if not has_commit(sha, cwd)]
+    if missing:
+        run_git("fetch", "--no-tags", "--depth=1", remote, *missing, cwd=cwd)
+
+
+def diff(
+    base: str,
+    head: str,
+    cwd: str | None = None,
+) -> str:
+    return run_git("diff", "--no-color", base, head, cwd=cwd)
+
+
+def merge_base(
+    base: str,
+    head: str,
+    cwd: str | None = None,
+) -> str:
+    return run_git("merge-base", base, head, cwd=cwd).strip()
+
+
+def log_commits(
+    base: str,
+    head: str,
+    cwd: str | None = None,
+) -> list[dict[str, Any]]:
+    """Commits in `base..head`, oldest first, shaped like `github.fetch_commits`."""
+    output = run_git(
+        "log",
+        "--reverse",
+        f"--format=%H{FIELD}%an{FIELD}%B{RECORD}",
+        f"{base}..{head}",
+        cwd=cwd,
+    )
+    commits = []
+    for record in output.split(RECORD):
+        if not record.strip():
+            continue
+        sha, author, message = record.lstrip("\n").split(FIELD)
+        commits.append(
+            {
+                "sha": sha,
+                "message": message.strip(),
+                "author": author,
+            },
+        )
+    return commits
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import re
+import urllib.request
+from typing import Any
+
+GITHUB_API_URL = "https://api.github.com"
+# The pull request commits endpoint returns at most 250 commits.
+PER_PAGE = 100
+
+
+def _get(
+    url: str,
+    token: str,
+) -> tuple[Any, str]:
+    request = urllib.request.Request(
+        url,
+        headers={
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {token}",
+            "X-GitHub-Api-Version": "2022-11-28",
+        },
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response), response.headers.get("Link", "")
+
+
+def _next_page(
+    link: str,
+) -> str | None:
+    match = re.search(r'<([^>]+)>;\s*rel="next"', link)
+    return match[1] if match else None
+
+
+def fetch_pull_request(
+    api_url: str,
+    repository: str,
+    number: int,
+    token: str,
+) -> dict[str, Any]:
+    pull_request, _ = _get(f"{api_url}/repos/{repository}/pulls/{number}", token)
+    return pull_request
+
+
+def fetch_commits(
+    api_url: str,
+    repository: str,
+    number: int,
+    token: str,
+) -> list[dict[str, Any]]:
+    """The pull request's commits, oldest first, as `sha`/`message`/`author`."""
+    url = f"{api_url}/repos/{repository}/pulls/{number}/commits?per_page={PER_PAGE}"
+    commits = []
+    while url:
+        page, link = _get(url, token)
+        commits += page
+        url = _next_page(link)
+
+    return [
+        {
+            "sha": commit["sha"],
+            "message": commit["commit"]["message"],
+            "author": commit["commit"]["author"]["name"],
+        }
+        for commit in commits
+    ]
+
+
+def fetch_merge_base(
+    api_url: str,
+    repository: str,
+    base: str,
+    head: str,
+    token: str,
+) -> str:
+    """The best common ancestor of `base` and `head`, as `git merge-base` finds it."""
+    comparison, _ = _get(
+        f"{api_url}/repos/{repository}/compare/{base}...{head}?per_page=1",
+        token,
+    )
+    return comparison["merge_base_commit"]["sha"]
@@ -0,0 +1,227 @@
+"""The batch runner against local stand-ins for the GitHub and OpenAI APIs."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+# The app reads its database URL from the environment once, on first use.
+DATABASE = os.path.join(tempfile.mkdtemp(), "batch.db")
+os.environ["DB_URL"] = os.environ["REFLEX_DB_URL"] = f"sqlite:///{DATABASE}"
+
+import reflex as rx  # noqa: E402
+from reflex.model import get_engine  # noqa: E402
+from sqlmodel import SQLModel, select  # noqa: E402
+
+from changelog_generator.backend import clients  # noqa: E402
+from changelog_generator.backend.batch import main  # noqa: E402
+from changelog_generator.backend.models import ChangelogJob  # noqa: E402
+
+# tag -> (commit sha, days after 2024-01-01)
+TAGS = {"v1": ("a", 0), "v2": ("c", 5), "v3": ("d", 8)}
+COMPARE = {("a", "c"): ["b", "c"], ("c", "d"): ["d"]}
+# (number, merged on day, merge commit sha)
+MERGED = [(3, 8, "d"), (2, 5, "c"), (1, 3, "b"), (0, 0, "a")]
+
+
+def _date(day: int) -> str:
+    return f"2024-01-{day + 1:02d}T00:00:00Z"
+
+
+class _Server:
+    """A local HTTP server recording the requests it answers."""
+
+    def __init__(self, handle) -> None:
+        self.requests: list[tuple[str, dict]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                server.requests.append((self.path, {}))
+                handle(self, None)
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                server.requests.append((self.path, body))
+                handle(self, body)
+
+        self._http = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._http.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._http.server_address[1]}"
+
+    def close(self) -> None:
+        self._http.shutdown()
+        self._http.server_close()
+
+
+def _send_json(handler: BaseHTTPRequestHandler, status: int, body) -> None:
+    data = json.dumps(body).encode()
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(data)))
+    handler.end_headers()
+    handler.wfile.write(data)
+
+
+def _github(handler: BaseHTTPRequestHandler, _) -> None:
+    url = urlparse(handler.path)
+    query = {name: values[0] for name, values in parse_qs(url.query).items()}
+    parts = url.path.strip("/").split("/")
+    if parts[:3] != ["repos", "o", "r"]:
+        _send_json(handler, 404, {"message": "Not Found"})
+    elif parts[3] == "commits":
+        sha, day = TAGS[parts[4]]
+        _send_json(
+            handler, 200, {"sha": sha, "commit": {"committer": {"date": _date(day)}}}
+        )
+    elif parts[3] == "compare":
+        shas = COMPARE[tuple(parts[4].split("..."))]
+        _send_json(
+            handler,
+            200,
+            {"total_commits": len(shas), "commits": [{"sha": sha} for sha in shas]},
+        )
+    elif parts[3] == "pulls":
+        page = [] if int(query.get("page", 1)) > 1 else MERGED
+        _send_json(
+            handler,
+            200,
+            [
+                {
+                    "number": number,
+                    "title": f"Change {number}",
+                    "body": "",
+                    "user": {"login": "dev"},
+                    "html_url": f"https://github.com/o/r/pull/{number}",
+                    "updated_at": _date(day),
+                    "merged_at": _date(day),
+                    "merge_commit_sha": sha,
+                }
+                for number, day, sha in page
+            ],
+        )
+
+
+def _openai(handler: BaseHTTPRequestHandler, body: dict) -> None:
+    if not body.get("stream"):
+        _send_json(
+            handler,
+            200,
+            {
+                "id": "summary",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "summary"},
+                        "finish_reason": "stop",
+                    },
+                ],
+            },
+        )
+        return
+
+    events = [
+        {
+            "id": "changelog",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": body["model"],
+            "choices": [
+                {"index": 0, "delta": {"content": text}, "finish_reason": None}
+            ],
+        }
+        for text in ("## Changes", "\n- Change")
+    ]
+    data = (
+        "".join(f"data: {json.dumps(event)}\n\n" for event in events)
+        + "data: [DONE]\n\n"
+    )
+    handler.send_response(200)
+    handler.send_header("Content-Type", "text/event-stream")
+    handler.send_header("Content-Length", str(len(data)))
+    handler.end_headers()
+    handler.wfile.write(data.encode())
+
+
+@pytest.fixture()
+def servers(tmp_path, monkeypatch):
+    github, openai = _Server(_github), _Server(_openai)
+    monkeypatch.setenv("GITHUB_API_URL", github.url)
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    monkeypatch.setenv("GITHUB_CACHE_PATH", str(tmp_path / "github_cache.db"))
+    monkeypatch.setenv("OPENAI_BASE_URL", f"{openai.url}/v1")
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    monkeypatch.setattr(clients, "CLIENT_OPEN_AI", None)
+    monkeypatch.setattr(clients, "GITHUB_RESPONSE_CACHE", None)
+
+    engine = get_engine()
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+
+    yield github, openai
+    github.close()
+    openai.close()
+
+
+def _manifest(tmp_path, *rows: str) -> str:
+    path = tmp_path / "manifest.csv"
+    path.write_text("repository,start_tag,end_tag\n" + "\n".join(rows) + "\n")
+    return str(path)
+
+
+def _jobs() -> dict[tuple[str, str, str], ChangelogJob]:
+    with rx.session() as session:
+        return {
+            (job.repository, job.start_tag, job.end_tag): job
+            for job in session.exec(select(ChangelogJob)).all()
+        }
+
+
+def test_rerun_skips_finished_jobs(tmp_path, servers):
+    github, openai = servers
+    manifest = _manifest(tmp_path, "o/r,v1,v2", "o/r,v2,v3")
+
+    assert main([manifest]) == 0
+    jobs = _jobs()
+    assert {key: job.status for key, job in jobs.items()} == {
+        ("o/r", "v1", "v2"): "done",
+        ("o/r", "v2", "v3"): "done",
+    }
+    assert jobs["o/r", "v1", "v2"].pull_request_count == 2
+    assert jobs["o/r", "v2", "v3"].pull_request_count == 1
+    assert jobs["o/r", "v1", "v2"].content == "## Changes\n- Change"
+
+    github_requests, model_requests = len(github.requests), len(openai.requests)
+    assert main([manifest]) == 0
+    assert len(github.requests) == github_requests
+    assert len(openai.requests) == model_requests
+
+
+def test_failing_repository_does_not_stop_the_batch(tmp_path, servers):
+    github, openai = servers
+    manifest = _manifest(tmp_path, "o/missing,v1,v2", "o/r,v1,v2")
+
+    assert main([manifest]) == 1
+    jobs = _jobs()
+    assert jobs["o/r", "v1", "v2"].status == "done"
+    assert jobs["o/missing", "v1", "v2"].status == "failed"
+    assert jobs["o/missing", "v1", "v2"].error.startswith("fetch: ")
+
+    # Only the failed job is retried.
+    model_requests = len(openai.requests)
+    assert main([manifest]) == 1
+    assert len(openai.requests) == model_requests
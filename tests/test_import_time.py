@@ -0,0 +1,59 @@
+"""Startup import time of the app, and the SDKs it must only load on first use."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+import reflex as rx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Cumulative import time allowed, under `-X importtime`, which adds its own
+# overhead.
+BUDGET_MS = 2500
+# Loaded on first fetch or generation by `backend.clients` and
+# `backend.github_client`.
+DEFERRED = ("openai", "httpx")
+
+
+def _import_times(
+    module: str,
+) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module `module` imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        cwd=ROOT,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative_us)
+    return times
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        pytest.param(
+            "changelog_generator.backend.backend",
+            marks=pytest.mark.skipif(
+                not hasattr(rx, "background"),
+                reason="the app state needs the Reflex 0.5 API",
+            ),
+        ),
+        "changelog_generator.backend.batch",
+    ],
+)
+def test_import_is_fast_and_defers_sdks(module: str) -> None:
+    times = _import_times(module)
+
+    assert times[module] / 1000 < BUDGET_MS
+    assert [name for name in DEFERRED if name in times] == []